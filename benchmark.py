@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import subprocess
+import time
+import glm
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Flies a scripted camera path through levels and reports frame times as JSON')
+    parser.add_argument('--levels', nargs='+', help='levels to benchmark, defaults to every registered level')
+    parser.add_argument('--frames', type=int, default=240, help='measured frames per case, one lap of the camera path')
+    parser.add_argument('--warmup', type=int, default=30, help='unmeasured frames before each case')
+    parser.add_argument('--radius', type=float, default=4, help='distance of the camera path from the portal position')
+    parser.add_argument('--portal', choices=['open', 'closed', 'both'], default='both')
+    parser.add_argument('--time', choices=['day', 'night', 'both'], default='both')
+    parser.add_argument('--software', action='store_true', help='render with Mesa\'s software rasterizer')
+    parser.add_argument('--offscreen', action='store_true', help='use SDL\'s offscreen video driver and a dummy audio driver, for machines without a display')
+    parser.add_argument('--replay', help='times an input recording from selva.py --record instead of the camera paths')
+    parser.add_argument('--output', default='benchmark.json', help='file to write the JSON to, the game prints to stdout')
+    return parser.parse_args()
+
+
+class Benchmark():
+
+    def __init__(self, game, frames: int, warmup: int, radius: float) -> None:
+        """
+        Runs a headless game through fixed camera paths. Each frame's position only depends on its index, so runs are comparable between commits
+        """
+        self.game = game
+        self.frames = frames
+        self.warmup = warmup
+        self.radius = radius
+
+        # measure the renderers at full resolution, the controller would otherwise trade resolution for frame time
+        game.resolution.min_scale = game.resolution.max_scale = game.resolution.scale = 1
+        game.player.control_disabled = True
+
+    def enter(self, name: str) -> None:
+        """
+        Moves the player into the level, mirroring Player.swap_to_level without going through a portal
+        """
+        game, player = self.game, self.game.player
+        if game.current_level.name == name: return
+
+        game.current_scene.remove(player.body_node)
+        game.current_scene.remove(player.loader)
+        game.current_scene.camera = game.hold_camera
+        game.memory_handler.current_level = game.memory_handler[name]
+        game.hold_camera = game.current_scene.camera
+        game.current_scene.camera = player.camera
+        game.current_scene.add(player.body_node)
+        game.current_scene.add(player.loader)
+
+    def set_case(self, name: str, portal: bool, day: bool) -> None:
+        """
+        Shows the portal at the level's portal position, looking into another level.
+        The other level is one the game already built, the first registered level or the portal's, so no case builds a level only to look into it
+        """
+        game = self.game
+        level = game.memory_handler[name]
+        other = next(other for other_name, other in game.memory_handler.nodes.items() if other_name != name)
+
+        game.day = day
+        game.portal_open = portal
+        game.portal_handler.set_levels(level, other)
+        game.portal_handler.update_time()
+        game.portal_handler.set_positions(level.portal_position + glm.vec3(0, 2.6, 0), other.portal_position + glm.vec3(0, 2.6, 0))
+        game.portal_handler.set_rotations(glm.quat(), glm.quat())
+        if not portal: game.portal_handler.portal.position.y = -100
+
+    def place(self, name: str, progress: float) -> None:
+        """
+        Puts the camera on a circle around the level's portal position, looking at its center
+        """
+        center = self.game.memory_handler[name].portal_position + glm.vec3(0, 2.6, 0)
+        angle = progress * 2 * glm.pi()
+        eye = center + glm.vec3(glm.cos(angle), 0, glm.sin(angle)) * self.radius
+
+        self.game.player.position = glm.vec3(eye.x, 2.1, eye.z)
+        self.game.camera.rotation = glm.quatLookAt(glm.normalize(center - eye), (0, 1, 0))
+
+    def run_case(self, name: str, portal: bool, day: bool) -> dict:
+        """
+        Renders one lap of the camera path and gets the frame time statistics in milliseconds, with the level's node and batch counts
+        """
+        self.enter(name)
+        self.set_case(name, portal, day)
+
+        times, binds = [], []
+        for frame in range(-self.warmup, self.frames):
+            self.place(name, frame / self.frames)
+            elapsed, counts = self.step()
+            if frame < 0: continue
+            times.append(elapsed)
+            binds.append(counts)
+
+        level = self.game.memory_handler[name]
+        return {'level' : name, 'portal' : portal, 'day' : day, **summarize(times), **average_binds(binds), 'nodes' : len(level.scene.nodes), 'draw_calls' : level.draw_calls}
+
+    def run_replay(self) -> dict:
+        """
+        Plays the game's input recording to its end and gets the frame time statistics in milliseconds
+        """
+        self.game.player.control_disabled = False
+
+        times, binds = [], []
+        while self.game.engine.running:
+            elapsed, counts = self.step()
+            times.append(elapsed)
+            binds.append(counts)
+
+        return {'replay' : self.game.input.path, **summarize(times[self.warmup:]), **average_binds(binds[self.warmup:])}
+
+    def step(self) -> tuple[float, dict[str, int]]:
+        """
+        Updates the game once and gets the frame's time in milliseconds and its texture bind counts
+        """
+        from render.state_tracker import state_tracker # imported with the game, after the drivers are chosen
+
+        start = time.perf_counter()
+        self.game.update()
+        self.game.engine.ctx.finish() # include the GPU work of the frame
+        return (time.perf_counter() - start) * 1000, state_tracker.last_frame
+
+    def run(self, levels: list[str], portals: list[bool], days: list[bool]) -> dict:
+        """
+        Runs every combination of level, portal state, and time of day, or the replay if the game is playing one.
+        The framebuffer pool's memory is reported for every renderer the run created
+        """
+        from render.framebuffer_pool import framebuffer_pool # imported with the game, after the drivers are chosen
+
+        info = self.game.engine.ctx.info
+        results = [self.run_replay()] if self.game.input.mode == 'replay' else [self.run_case(name, portal, day) for name in levels for portal in portals for day in days]
+        renderers = [renderer for level in self.game.memory_handler.nodes.values() for renderer in level.renderers]
+        return {
+            'commit'       : commit(),
+            'renderer'     : info['GL_RENDERER'],
+            'window'       : list(self.game.engine.win_size),
+            'frames'       : self.frames,
+            'results'      : results,
+            'framebuffers' : framebuffer_pool.report(renderers),
+        }
+
+
+def summarize(times: list[float]) -> dict[str, float]:
+    """
+    Gets the min, mean, p95, p99 and max of the frame times
+    """
+    ordered = sorted(times)
+    percentile = lambda q: ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+    return {'min' : ordered[0], 'mean' : sum(ordered) / len(ordered), 'p95' : percentile(0.95), 'p99' : percentile(0.99), 'max' : ordered[-1]}
+
+def average_binds(binds: list[dict[str, int]]) -> dict[str, float]:
+    """
+    Gets the mean texture binds issued and skipped per frame
+    """
+    if not binds: return {'binds' : 0, 'skipped_binds' : 0}
+    return {'binds' : sum([counts['binds'] for counts in binds]) / len(binds), 'skipped_binds' : sum([counts['skipped'] for counts in binds]) / len(binds)}
+
+def commit() -> str | None:
+    """
+    Gets the checked out commit, the results are compared between commits
+    """
+    try: return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): return None
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    # the drivers are chosen when pygame and the GL context start, so they are set before the game is imported
+    if args.software: os.environ['LIBGL_ALWAYS_SOFTWARE'] = '1'
+    if args.offscreen:
+        os.environ['SDL_VIDEODRIVER'] = 'offscreen'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    from game import Game
+    game = Game(menu = bool(args.replay), headless = True, replay = args.replay) # recordings start at the main menu
+
+    levels = args.levels if args.levels else list(game.memory_handler.factories)
+    portals = {'open' : [True], 'closed' : [False], 'both' : [True, False]}[args.portal]
+    days = {'day' : [True], 'night' : [False], 'both' : [True, False]}[args.time]
+
+    for name in levels:
+        if name not in game.memory_handler.factories: raise ValueError(f'Benchmark has no level {name}, expected one of {list(game.memory_handler.factories)}')
+
+    results = Benchmark(game, args.frames, args.warmup, args.radius).run(levels, portals, days)
+    with open(args.output, 'w') as file: json.dump(results, file, indent = 4)
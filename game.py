@@ -1,14 +1,24 @@
-import os
+import time
 import moderngl as mgl
 import basilisk as bsk
 from levels.level import Level
 from levels.generators.imports import *
 
 from player.player import Player
+from helper.asset_loader import AssetLoader, AssetDict
+from helper.replay import InputReplay
+from helper.mesh_cache import mesh_cache
 from images.images import images
+from levels.manifest import LevelManifest, CORE
 from memories.memory_handler import MemoryHandler
 from render.loading_screen import LoadingScreen
 from render.portal_handler import PortalHandler
+from render.render_graph import RenderGraph
+from render.scene_changes import SceneChanges
+from render.gpu_timer import GPUTimer
+from render.resolution import ResolutionController
+from render.shader_cache import shader_cache
+from render.state_tracker import state_tracker
 from levels.main_menu import MainMenu
 from levels.end_cutscene import EndCutscene
 from ui.effects import *
@@ -16,20 +26,34 @@ from ui.effects import *
 
 class Game():
     
-    def __init__(self) -> None:
+    def __init__(self, menu: bool=True, headless: bool=False, record: str=None, replay: str=None) -> None:
+        """
+        Loads the game and shows the main menu. Headless games render without vsync to an offscreen framebuffer behind a minimized window, used by the benchmark.
+        Record and replay are paths of input recordings to write or play back
+        """
         # Basilisk Engine overhead
-        self.engine = bsk.Engine((1000, 800), resizable=False)   
+        self.engine = bsk.Engine((1000, 800), resizable=False, vsync=False, headless=True) if headless else bsk.Engine((1000, 800), resizable=False)
+        # framebuffer the frame is composited onto. Basilisk's headless window is 300x50, so headless frames go to one of the window size instead
+        self.screen: mgl.Framebuffer = self.engine.ctx.simple_framebuffer(self.engine.win_size) if headless else self.engine.ctx.screen
+        self.input = InputReplay(self, record, replay) # seeds randomness before any level is generated
         
         self.ui_scene = bsk.Scene(self.engine) # scene to contain player UI like held items
-        self.ui_fbo = bsk.Framebuffer(self.engine)
         self.ui_scene.sky = None
         self.ui_scene.camera = bsk.StaticCamera()
+        self.ui_fbo = bsk.Framebuffer(self.engine)
+        self.ui_changes = SceneChanges(self.ui_scene)
         
         self.overlay_scene = bsk.Scene(self.engine) # this scene will render over 
         self.overlay_scene.sky = None
         self.overlay_scene.camera = bsk.StaticCamera()
         self.overlay_fbo = bsk.Framebuffer(self.engine)
+        self.overlay_changes = SceneChanges(self.overlay_scene)
         self.overlay_on = False
+        
+        # the ui renders are kept between frames while their scenes are unchanged, Basilisk clears every registered framebuffer each frame.
+        # They are cleared before they are rendered again instead
+        self.engine.fbos.remove(self.ui_fbo)
+        self.engine.fbos.remove(self.overlay_fbo)
 
         # Create the loading screen
         self.engine.mouse.grab = False
@@ -40,14 +64,19 @@ class Game():
         self.day = True
         self.portal_open = False
         self.hold_camera = None
+        self.resolution = ResolutionController()
         self.dial_was_unlocked = False
         
-        # game components
+        # game components, decoded on worker threads and collected here for the GL upload
+        # level specific assets are loaded from the level manifests when each level is built
+        self.asset_loader = AssetLoader(self.loading_screen)
+        self.images = images
+        self.meshes = AssetDict(self.load_mesh)
+        self.load_materials()
+        self.queue_assets()
         self.load_sounds()
         self.sounds['title_screen'].play(loops=20)
-        self.load_images()
-        self.load_materials()
-        self.load_meshes()
+        self.collect_manifest(CORE, self.pending_assets.pop('core'), progress=True)
         self.load_shaders()
         self.load_fbos()
         
@@ -99,31 +128,26 @@ class Game():
         # ui
         self.ui = UI(self)
         
-        # level layout
+        # level layout, levels are built on first access. The first registered level is the starting level
+        self.gpu_timer = GPUTimer(self.engine.ctx) # levels give it to their renderers to time their stages
+        self.atlas_size = 0
         self.memory_handler = MemoryHandler(self)
-        self.memory_handler['void1'] = void1(self)
+        for name, factory in (('void1', void1), ('bedroom1', bedroom1), ('office', office), ('boat', boat), ('art', art), ('bedroom2', bedroom2), ('void2', void2)):
+            self.memory_handler.register(name, factory)
         self.loading_screen.update()
-        self.memory_handler['bedroom1'] = bedroom1(self)
-        self.loading_screen.update()
-        self.memory_handler['office'] = office(self)
-        self.loading_screen.update()
-        self.memory_handler['boat'] = boat(self)
-        self.loading_screen.update()
-        self.memory_handler['art'] = art(self)
-        self.loading_screen.update()
-        self.memory_handler['bedroom2'] = bedroom2(self)
-        self.loading_screen.update()
-        self.memory_handler['void2'] = void2(self)
-        self.loading_screen.update()
-        
-        for image in self.images.values():
-            self.engine.material_handler.image_handler.images.append(image)
-            self.loading_screen.update()
 
-        self.engine.material_handler.image_handler.write(regenerate=True)
+        self.refresh_atlas()
+        self.loading_screen.update()
 
         self.portal_handler = PortalHandler(self, self.memory_handler['void1'], self.memory_handler['void2'])
 
+        # frame layout, the ui and overlay are drawn over whatever the portal pipeline puts on the screen
+        self.render_graph = RenderGraph(self.engine, timer=self.gpu_timer)
+        self.portal_handler.add_passes(self.render_graph)
+        self.render_graph.add_pass('ui_scene', self.render_ui, outputs=['ui'], active=lambda: self.ui_changes.dirty and self.ui_changes.visible)
+        self.render_graph.add_pass('overlay_scene', self.render_overlay, outputs=['overlay'], active=lambda: self.overlay_on and self.overlay_changes.dirty and self.overlay_changes.visible)
+        self.render_graph.add_pass('interface', self.render_interface, inputs=['screen', 'ui', 'overlay'], outputs=['screen'])
+
         # player
         self.player = Player(self)
         
@@ -133,7 +157,7 @@ class Game():
 
         self.end_cutscene = EndCutscene(self)
         self.main_menu = MainMenu(self)
-        self.main_menu.start()
+        if menu: self.main_menu.start()
 
     def adjacent_levels(self, origin_level: Level) -> set[Level]:
         """
@@ -160,8 +184,11 @@ class Game():
             'art_table', 'bear_chair', 'art_wall', 'art_ceiling', 'paint_bucket_red', 'paint_bucket_blue', 'paint_bucket_yellow', 'window_two_pane', 'color_combos', 'color_key', 'key_key', 'water_mug', 'key_color'
         ] + [f'key{i}' for i in range(1, 10)] + [f'key{i}_white' for i in range(1, 10)]
         
-        self.materials = {name : bsk.Material(texture = images[f'{name}.png']) for name in png_names}
-        self.materials['ocean'] = bsk.Material(texture = images['ocean.jpg'])
+        # textured materials are created on first use so their images are only decoded when needed
+        self.material_textures = {name : f'{name}.png' for name in png_names}
+        self.material_textures['ocean'] = 'ocean.jpg'
+        self.materials = AssetDict(lambda name: bsk.Material(texture = self.images[self.material_textures[name]]))
+        
         self.materials['white'] = bsk.Material(color = (220, 220, 220))
         self.materials['black'] = bsk.Material(color = (20, 20, 20))
         self.materials['red'] = bsk.Material(color = (255, saturation, saturation))
@@ -184,41 +211,62 @@ class Game():
         self.materials['bloom_yellow'] = bsk.Material(color = (211, 198, 74), emissive_color=(260, 250, 120))
         self.materials['bulb'] = bsk.Material(color = (211, 198, 74), emissive_color=(5200, 5000, 2400))
         
-    def load_images(self) -> None:
+    def queue_assets(self) -> None:
         """
-        Loads all images from the images folder
+        Submits all sounds and the core images and meshes to the asset loader's workers
         """
-
-        self.images = {}
-        for file_name in os.listdir('./images'):
-            self.loading_screen.update()
-            if not (file_name.endswith('.png') or file_name.endswith('.jpeg') or file_name.endswith('.jpg')):
-                self.loading_screen.update()
-                continue
-            self.images[file_name] = bsk.Image(f'./images/{file_name}', flip_y=False)
-
-    def load_meshes(self) -> None:
+        self.pending_assets = {
+            'sounds' : self.asset_loader.load_folder('./sounds', ('.mp3', '.wav'), bsk.Sound, lambda file_name: file_name[:-4]),
+            'core'   : self.queue_manifest(CORE),
+        }
+        self.loading_screen.total = self.loading_screen.progess + sum([len(futures) for futures in self.pending_assets.values()]) + 3
+        
+    def queue_manifest(self, manifest: LevelManifest) -> dict:
+        """
+        Submits the manifest's images, material textures, and meshes that have not been loaded yet to the asset loader's workers
+        """
+        files = manifest.images + [self.material_textures[name] for name in manifest.materials]
+        futures = {file : self.asset_loader.submit(self.images.load, file) for file in files if file not in self.images}
+        futures.update({name : self.asset_loader.submit(self.load_mesh, name) for name in manifest.meshes if name not in self.meshes})
+        return futures
+    
+    def collect_manifest(self, manifest: LevelManifest, futures: dict, progress: bool=False) -> None:
         """
-        Loads all meshes from the meshes folder
+        Waits for the manifest's assets and creates its textured materials
         """
+        loaded = self.asset_loader.collect(futures, progress)
+        self.meshes.update({name : loaded[name] for name in manifest.meshes if name in loaded})
+        for name in manifest.materials: self.materials[name] # creates the material if it does not exist yet
         
-        self.meshes = {}
-        for file_name in os.listdir('./meshes'):
-            self.loading_screen.update()
-            # if file_name[:-4] not in ['selva_title', 'start', 'options']: continue
-            if not file_name.endswith('.obj'): continue
-            self.meshes[file_name[:-4]] = bsk.Mesh(f'./meshes/{file_name}')
+    def load_manifest(self, manifest: LevelManifest) -> None:
+        """
+        Loads everything listed in a level's manifest
+        """
+        self.collect_manifest(manifest, self.queue_manifest(manifest))
+        
+    def load_mesh(self, name: str) -> bsk.Mesh:
+        """
+        Loads a single mesh from the meshes folder
+        """
+        return mesh_cache.load(f'{mesh_cache.folder}/{name}.obj')
+        
+    def refresh_atlas(self) -> None:
+        """
+        Adds newly decoded images to the texture atlas, each unique image is added once
+        """
+        if len(self.images) == self.atlas_size: return
+        self.atlas_size = len(self.images)
+        
+        image_handler = self.engine.material_handler.image_handler
+        for image in self.images.values():
+            if not any(image is added for added in image_handler.images): image_handler.images.append(image)
+        image_handler.write(regenerate=True)
         
     def load_sounds(self) -> None:
         """
         Loads all sounds from the sounds folder
         """
-
-        self.sounds = {}
-        for file_name in os.listdir('./sounds'):
-            self.loading_screen.update()
-            if not file_name.endswith('.mp3') and not file_name.endswith('.wav'): continue
-            self.sounds[file_name[:-4]] = bsk.Sound(f'./sounds/{file_name}')
+        self.sounds = self.asset_loader.collect(self.pending_assets.pop('sounds'))
 
         self.sounds['PageTurn'].volume = 25
         self.sounds['ItemPickupFanfare'].volume = 15
@@ -231,8 +279,8 @@ class Game():
         Loads all shaders from the shaders folder
         """
         self.shaders = {
-            'kuwahara' : bsk.Shader(self.engine, vert="shaders/frame.vert", frag="shaders/kuwahara.frag"),
-            'invisible': bsk.Shader(self.engine, vert="shaders/invisible.vert", frag="shaders/invisible.frag")
+            'kuwahara' : shader_cache.load(self.engine, vert="shaders/frame.vert", frag="shaders/kuwahara.frag"),
+            'invisible': shader_cache.load(self.engine, vert="shaders/invisible.vert", frag="shaders/invisible.frag")
         }
         
     def load_fbos(self) -> None:
@@ -248,17 +296,20 @@ class Game():
         Updates all adjacent scenes and the engine
         """
         
+        self.input.begin_frame()
+        
         # standard ui
         bsk.draw.circle(self.engine, (0, 0, 0), (self.engine.win_size[0] / 2, self.engine.win_size[1] / 2), radius = 2)
         self.player.teleport()
         self.main_update()
         
     def main_update(self) -> None:
+        frame_start = time.perf_counter()
         self.ui.update(self.engine.delta_time)
         # update interactibles in the current level
-        if self.engine.delta_time < 0.1:
-            for interact in self.current_level.interactables.values():
-                if interact.passive: interact.passive(self.engine.delta_time)
+        if self.engine.delta_time < 0.1: 
+            self.current_level.scheduler.update(self.engine.delta_time)
+            self.current_level.falling.update(self.engine.delta_time)
 
         self.ui_scene.camera.position = self.camera.position
         self.ui_scene.camera.rotation = self.camera.rotation
@@ -269,25 +320,57 @@ class Game():
         self.track_io_holds()
         
         self.portal_handler.update()
-        self.portal_handler.render()
-
-        self.ui_scene.render(self.ui_fbo)
+        self.resolution.apply([self.portal_handler.main_renderer, self.portal_handler.other_renderer])
+        self.gpu_timer.draw(self.engine) # queued for the interface pass
+        
+        # held items move with the player, so changes are checked after the player's update
+        self.ui_changes.update()
         if self.overlay_on:
             self.overlay_scene.update(render=False)
-            self.overlay_scene.render(self.overlay_fbo)
+            self.overlay_changes.update()
+        self.render_graph.execute()
+        self.gpu_timer.end_frame()
+        state_tracker.end_frame()
+        self.resolution.update(self.render_time(frame_start), self.engine.delta_time)
+
+        self.engine.update(render=False)
         
+        # spend left over frame time building levels the player is likely to open next
+        self.memory_handler.prefetcher.update()
+        
+    def render_time(self, frame_start: float) -> float:
+        """
+        Gets the seconds the frame took before the flip. The GPU timer's measurement is used as well while it is on,
+        GL calls return before the GPU finishes them
+        """
+        cpu = time.perf_counter() - frame_start
+        gpu = self.gpu_timer.last_frame()
+        return max(cpu, gpu / 1000) if gpu is not None else cpu
+
+    def render_ui(self, graph: RenderGraph) -> None:
+        self.ui_fbo.clear()
+        self.ui_scene.render(self.ui_fbo)
+
+    def render_overlay(self, graph: RenderGraph) -> None:
+        self.overlay_fbo.clear()
+        self.overlay_scene.render(self.overlay_fbo)
+
+    def render_interface(self, graph: RenderGraph) -> None:
+        """
+        Blends the ui and overlay onto the screen and draws Basilisk's 2D elements. Empty scenes are not blended
+        """
         self.engine.ctx.disable(mgl.DEPTH_TEST)
         self.engine.ctx.enable(mgl.BLEND)
         self.engine.ctx.blend_func = mgl.DEFAULT_BLENDING
         
-        self.ui_fbo.render()
-        if self.overlay_on: self.overlay_fbo.render()
+        self.screen.use() # the draw handler renders to the bound framebuffer
+        if self.ui_changes.visible: self.ui_fbo.render(self.screen)
+        if self.overlay_on and self.overlay_changes.visible: self.overlay_fbo.render(self.screen)
         
+        self.refresh_atlas() # ui images can be requested mid-frame
         self.engine.draw_handler.render()
         self.engine.ctx.enable(mgl.DEPTH_TEST)
         self.engine.ctx.disable(mgl.BLEND)
-
-        self.engine.update(render=False)
         
     def track_io_holds(self) -> None:
         """
@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Any
+
+
+class AssetLoader():
+
+    def __init__(self, loading_screen: Any, workers: int=None) -> None:
+        """
+        Decodes asset files on a pool of worker threads. Only the main thread touches the engine and the loading screen
+        """
+        self.loading_screen = loading_screen
+        self.pool = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = 'asset_loader')
+
+    def submit(self, func: Callable, *args) -> Future:
+        """
+        Runs a single decode function on the worker pool
+        """
+        return self.pool.submit(func, *args)
+
+    def load_folder(self, folder: str, extensions: tuple[str], func: Callable, key: Callable=None) -> dict[str, Future]:
+        """
+        Submits every file in the folder with a matching extension to the workers.
+        Returns the pending futures keyed by asset name, key(file_name) if given else the file name
+        """
+        futures = {}
+        for file_name in os.listdir(folder):
+            if not file_name.endswith(extensions):
+                self.loading_screen.update() # skipped files still count towards the loading bar
+                continue
+            futures[key(file_name) if key else file_name] = self.submit(func, f'{folder}/{file_name}')
+        return futures
+
+    def collect(self, futures: dict[str, Future], progress: bool=True) -> dict[str, Any]:
+        """
+        Waits on the main thread for the given futures, advancing the loading screen as each one finishes.
+        Without progress the futures are waited on silently, for loads that happen during gameplay
+        """
+        pending = set(futures.values())
+        while pending and not progress: pending = wait(pending).not_done
+        while pending:
+            done, pending = wait(pending, timeout = 1 / 30, return_when = FIRST_COMPLETED)
+            for _ in done: self.loading_screen.update()
+            if not done: self.loading_screen.draw() # keep the window responsive while workers are busy
+
+        # raises any exception from the workers on the main thread
+        return {name : future.result() for name, future in futures.items()}
+
+
+class AssetDict(dict):
+
+    def __init__(self, load: Callable, *args, **kwargs) -> None:
+        """
+        Dictionary of assets that loads any missing key on first access
+        """
+        super().__init__(*args, **kwargs)
+        self.load = load
+
+    def __missing__(self, key: str) -> Any:
+        value = self[key] = self.load(key)
+        return value
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import numpy as np
+import basilisk as bsk
+
+
+class ArrayPickler(pickle.Pickler):
+
+    def __init__(self, file, arrays: list[np.ndarray]) -> None:
+        """
+        Pickles a mesh while pulling its numpy arrays out into a separate list so they can be stored as raw .npy files
+        """
+        super().__init__(file, protocol = pickle.HIGHEST_PROTOCOL)
+        self.arrays = arrays
+        self.ids: dict[int, int] = {}
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, np.ndarray) or obj.dtype == object: return None
+        if id(obj) not in self.ids:
+            self.ids[id(obj)] = len(self.arrays)
+            self.arrays.append(obj)
+        return self.ids[id(obj)]
+
+
+class ArrayUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, base: str) -> None:
+        """
+        Restores a mesh pickled by ArrayPickler, memory mapping its arrays instead of reading them
+        """
+        super().__init__(file)
+        self.base = base
+        self.arrays: dict[int, np.ndarray] = {}
+
+    def persistent_load(self, pid):
+        if pid not in self.arrays: self.arrays[pid] = np.load(f'{self.base}.{pid}.npy', mmap_mode='c') # copy on write keeps the cache file intact
+        return self.arrays[pid]
+
+
+class MeshCache():
+
+    def __init__(self, folder: str='./meshes', cache_folder: str='./meshes/.cache') -> None:
+        """
+        Compiled cache of parsed .obj files. Entries are keyed by the source file's content hash and modification time
+        """
+        self.folder = folder
+        self.cache_folder = cache_folder
+        self.manifest_path = f'{cache_folder}/manifest.json'
+        self.lock = threading.Lock()
+        self.manifest: dict[str, dict] = self.read_manifest()
+
+    def load(self, path: str) -> bsk.Mesh:
+        """
+        Gets the mesh for the .obj file, from the cache when the source is unchanged. Safe to call from worker threads
+        """
+        name = os.path.basename(path)[:-4]
+        mtime = os.path.getmtime(path)
+        entry = self.manifest.get(name)
+
+        # an unchanged mtime is trusted, otherwise the contents decide whether the entry is stale
+        digest = None if entry and entry['mtime'] == mtime else self.hash(path)
+        if entry and (digest is None or entry['hash'] == digest):
+            mesh = self.read(entry)
+            if mesh:
+                if digest: self.update(name, dict(entry, mtime = mtime))
+                return mesh
+
+        mesh = bsk.Mesh(path)
+        self.write(name, mesh, digest if digest else self.hash(path), mtime, entry)
+        return mesh
+
+    def hash(self, path: str) -> str:
+        """
+        Hashes the contents of the source file
+        """
+        with open(path, 'rb') as file: return hashlib.sha1(file.read()).hexdigest()
+
+    def read(self, entry: dict) -> bsk.Mesh | None:
+        """
+        Reads a cached mesh, returns None if the cache files are missing or corrupt
+        """
+        base = f'{self.cache_folder}/{entry["file"]}'
+        try:
+            with open(f'{base}.pkl', 'rb') as file: return ArrayUnpickler(file, base).load()
+        except (OSError, EOFError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+            return None
+
+    def write(self, name: str, mesh: bsk.Mesh, digest: str, mtime: float, previous: dict=None) -> None:
+        """
+        Stores the parsed mesh as a pickle with its arrays in .npy files next to it
+        """
+        os.makedirs(self.cache_folder, exist_ok = True)
+        entry = {'file' : f'{name}-{digest[:16]}', 'hash' : digest, 'mtime' : mtime}
+        base = f'{self.cache_folder}/{entry["file"]}'
+
+        arrays = []
+        try:
+            with open(f'{base}.pkl', 'wb') as file: ArrayPickler(file, arrays).dump(mesh)
+            for index, array in enumerate(arrays): np.save(f'{base}.{index}.npy', np.ascontiguousarray(array))
+        except (OSError, TypeError, AttributeError, pickle.PicklingError):
+            return # meshes that cannot be pickled are simply parsed every launch
+
+        if previous and previous['file'] != entry['file']: self.remove(previous)
+        self.update(name, entry)
+
+    def remove(self, entry: dict) -> None:
+        """
+        Deletes the files of a stale cache entry
+        """
+        for file_name in os.listdir(self.cache_folder):
+            if file_name.startswith(f'{entry["file"]}.'): os.remove(f'{self.cache_folder}/{file_name}')
+
+    def update(self, name: str, entry: dict) -> None:
+        """
+        Records the entry and saves the manifest
+        """
+        with self.lock:
+            self.manifest[name] = entry
+            with open(self.manifest_path, 'w') as file: json.dump(self.manifest, file, indent = 1)
+
+    def read_manifest(self) -> dict[str, dict]:
+        """
+        Loads the manifest of cached meshes, starting over if it is missing or unreadable
+        """
+        try:
+            with open(self.manifest_path) as file: return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+
+mesh_cache = MeshCache()
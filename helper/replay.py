@@ -0,0 +1,128 @@
+import gzip
+import json
+import random
+import time
+import basilisk as bsk
+
+
+def held_codes(keys: bsk.pg.key.ScancodeWrapper) -> list[int]:
+    """
+    Gets the scancodes held in a key state. pygame-ce does not allow iterating over key states, only indexing them
+    """
+    return [code for code in range(len(keys)) if keys[code]]
+
+
+class EngineInput():
+
+    def __init__(self, engine: bsk.Engine) -> None:
+        """
+        The private parts of Basilisk that a replay drives, kept here so an engine update only has to be matched in one place.
+        Basilisk has no public way to poll input before Engine.update or to replace a frame's time and mouse state
+        """
+        self.engine = engine
+
+    def poll(self) -> None:
+        """
+        Polls input and ticks the clock early. Engine.update runs the same internal update, which locks itself until the next update
+        """
+        self.engine._update()
+
+    def set_delta_time(self, delta_time: float) -> None:
+        """
+        Replaces the frame's delta time. The clock already added the real frame time to its total, and the engine's time attributes
+        are copies that the clock only refreshes through its misspelled set_engine_attribiutes
+        """
+        clock = self.engine.clock
+        clock.time += delta_time - clock.delta_time
+        clock.delta_time = delta_time
+        clock.set_engine_attribiutes()
+
+    def set_mouse(self, position: list, relative: list, buttons: list, previous_buttons: list) -> None:
+        """
+        Replaces the mouse state. The position and relative properties have no setters, so their backing attributes are written
+        """
+        mouse = self.engine.mouse
+        mouse._position, mouse._relative = list(position), list(relative)
+        mouse.buttons, mouse.previous_buttons = tuple(buttons), tuple(previous_buttons)
+
+
+class InputReplay():
+
+    def __init__(self, game, record: str=None, replay: str=None) -> None:
+        """
+        Records the input of every frame to a file or plays a recording back in place of the player's input.
+        The game draws its randomness from this replay's generator, which is reseeded from the recorded seed every frame and for every level build,
+        so a replay makes the same choices as its recording without touching the random module's shared state
+        """
+        if record and replay: raise ValueError('InputReplay cannot record and replay at the same time')
+        self.game = game
+        self.engine = game.engine
+        self.engine_input = EngineInput(self.engine)
+        self.mode = 'record' if record else 'replay' if replay else None
+        self.path = record if record else replay
+
+        self.frame = 0
+        self.frames: list[list] = []
+        self.seed: int = None
+        if self.mode == 'record': self.seed = time.time_ns() % 2 ** 32
+        if self.mode == 'replay':
+            with gzip.open(self.path, 'rt') as file: data = json.load(file)
+            self.seed, self.frames = data['seed'], data['frames']
+        self.random = random.Random(self.seed) # seeded from the system when not recording or replaying
+
+    def begin_frame(self) -> None:
+        """
+        Polls the engine's input for the frame, then records it or replaces it with the recorded frame.
+        Called before anything reads input, Basilisk does not poll again until Engine.update
+        """
+        if not self.mode: return
+        self.engine_input.poll()
+        self.random.seed(f'{self.seed}:{self.frame}')
+
+        if self.mode == 'record': self.frames.append(self.capture())
+        elif self.frame < len(self.frames): self.apply(self.frames[self.frame])
+        else: self.engine.running = False # the recording is over
+        self.frame += 1
+
+    def seed_level(self, name: str) -> None:
+        """
+        Seeds the generator for a level being built, so its layout does not depend on the frame it is built in
+        """
+        if self.seed is not None: self.random.seed(f'{self.seed}:{name}')
+
+    def capture(self) -> list:
+        """
+        Gets the frame's input as [delta time, keys, previous keys, mouse position, mouse movement, buttons, previous buttons].
+        Keys are stored as the scancodes that are held
+        """
+        mouse = self.engine.mouse
+        return [
+            self.engine.delta_time,
+            held_codes(self.engine.keys),
+            held_codes(self.engine.previous_keys),
+            list(mouse.position), list(mouse.relative),
+            list(mouse.buttons), list(mouse.previous_buttons)
+        ]
+
+    def apply(self, frame: list) -> None:
+        """
+        Replaces the engine's input and time with a recorded frame
+        """
+        delta_time, keys, previous_keys, position, relative, buttons, previous_buttons = frame
+        size = len(self.engine.keys)
+
+        self.engine_input.set_delta_time(delta_time)
+
+        held = set(keys)
+        self.engine.keys = bsk.pg.key.ScancodeWrapper([code in held for code in range(size)])
+        held = set(previous_keys)
+        self.engine.previous_keys = self.engine.prev_keys = bsk.pg.key.ScancodeWrapper([code in held for code in range(size)])
+
+        self.engine_input.set_mouse(position, relative, buttons, previous_buttons)
+
+    def save(self) -> None:
+        """
+        Writes the recording, does nothing when not recording
+        """
+        if self.mode != 'record': return
+        with gzip.open(self.path, 'wt') as file: json.dump({'seed' : self.seed, 'frames' : self.frames}, file, separators = (',', ':'))
@@ -41,8 +41,11 @@ class Interactable():
     node: bsk.Node
     active: Callable
     passive: Callable
+    interval: float
     
     def update(self) -> None: ...
+    def sleep(self, time: float=None, watch: bsk.Node=None) -> None: ...
+    def wake(self) -> None: ...
     
 
 @dataclass
@@ -1,8 +1,58 @@
-from basilisk import Image
+import hashlib
 import os
+import threading
+from concurrent.futures import Future
+from typing import Any
+from basilisk import Image
+
+
+class ImageRegistry():
+
+    def __init__(self, folder: str='./images', extensions: tuple[str]=('.png', '.jpeg', '.jpg')) -> None:
+        """
+        Content addressed store for the images folder. Files are hashed and each unique image is decoded once, on first use
+        """
+        self.folder = folder
+        self.extensions = extensions
+        self.digests: dict[str, str] = {} # file name -> content hash
+        self.images: dict[str, Image] = {} # content hash -> decoded image
+        self.lock = threading.Lock()
+
+    def load(self, file_name: str) -> Image:
+        """
+        Gets the image for the file, decoding it if its contents have not been seen before. Safe to call from worker threads
+        """
+        if file_name in self.digests: return self.images[self.digests[file_name]]
+
+        path = f'{self.folder}/{file_name}'
+        with open(path, 'rb') as file: digest = hashlib.sha1(file.read()).hexdigest()
+        with self.lock:
+            if digest in self.images:
+                self.digests[file_name] = digest
+                return self.images[digest]
+
+        image = Image(path, flip_y=False)
+        with self.lock:
+            image = self.images.setdefault(digest, image) # another worker may have decoded identical contents first
+            self.digests[file_name] = digest
+        return image
+
+    def queue(self, loader: Any) -> dict[str, Future]:
+        """
+        Submits every image in the folder to the AssetLoader's workers
+        """
+        return loader.load_folder(self.folder, self.extensions, lambda path: self.load(os.path.basename(path)))
+
+    def values(self) -> list[Image]:
+        """
+        Gets every decoded image once, regardless of how many files share its contents
+        """
+        return list(self.images.values())
+
+    def __getitem__(self, file_name: str) -> Image: return self.load(file_name)
+    def __contains__(self, file_name: str) -> bool: return file_name in self.digests
+    def __len__(self) -> int: return len(self.images)
+
 
-images = {
-    file_name : Image(f'./images/{file_name}', flip_y=False) 
-    for file_name in os.listdir('./images') 
-    if file_name.endswith(('.png', '.jpeg', '.jpg'))
-}
\ No newline at end of file
+# shared by materials, ui blits, and the texture atlas. Nothing is decoded until it is first requested
+images = ImageRegistry()
@@ -17,7 +17,8 @@ class FishData():
         
 class FishTracker():
     
-    def __init__(self) -> None:
+    def __init__(self, generator: random.Random=random) -> None:
+        self.generator = generator # the game's generator, so replays catch the same fish
         self.record: dict[str, float] = {}
         self.fish: dict[str: FishData] = {
             'tuna':     FishData(10,   0.6,  1.40),
@@ -41,13 +42,13 @@ class FishTracker():
         Gets a random fish
         """
         # select the fish type
-        rand = random.uniform(0, self.total_probability)
+        rand = self.generator.uniform(0, self.total_probability)
         for name, fish in self.fish.items():
             kind = name
             rand -= fish.probability
             if rand <= 0: break
         # select the size and return fish
-        size = float(f'{random.uniform(self.fish[kind].min, self.fish[kind].max):.2f}')
+        size = float(f'{self.generator.uniform(self.fish[kind].min, self.fish[kind].max):.2f}')
         return Fish(kind, size)
         
     @property
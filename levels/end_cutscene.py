@@ -35,6 +35,8 @@ class EndCutscene:
         Updates the menu. Increments time. Checks for input. Adds particles. Handles start sequence.
         """
 
+        self.game.input.begin_frame()
+
         self.time += self.engine.delta_time
         if self.time > 2: 
             self.running = False
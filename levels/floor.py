@@ -0,0 +1,155 @@
+import glm
+import numpy as np
+import basilisk as bsk
+from typing import Callable, Any
+from helper.type_hints import Level
+
+
+def get_triangles(node: bsk.Node) -> np.ndarray:
+    """
+    Gets the world space triangles of a node's mesh as an (n, 3, 3) array
+    """
+    matrix = np.array(node.model_matrix)
+    points = np.asarray(node.mesh.points, dtype='f8') @ matrix[:3, :3].T + matrix[:3, 3]
+    return points[np.asarray(node.mesh.indices)]
+
+def rasterize(triangles: np.ndarray, origin: np.ndarray, shape: tuple[int, int], cell_size: float, epsilon: float=1e-6) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gets the cells whose centers lie under each triangle and the triangle's height there.
+    Every triangle is paired with the cells of its bounding rectangle at once, then the pairs outside it are dropped
+    """
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab, ac = (b - a)[:, [0, 2]], (c - a)[:, [0, 2]]
+    determinant = ab[:, 0] * ac[:, 1] - ac[:, 0] * ab[:, 1]
+    flat = triangles[:, :, [0, 2]]
+
+    low = np.floor((flat.min(axis = 1) - origin) / cell_size).astype(int)
+    high = np.floor((flat.max(axis = 1) - origin) / cell_size).astype(int)
+    low, high = np.maximum(low, 0), np.minimum(high, np.array(shape) - 1)
+    counts = np.clip(high - low + 1, 0, None).prod(axis = 1) * (np.abs(determinant) > epsilon) # walls have no area from above
+    if not counts.sum(): return np.zeros(0, dtype=int), np.zeros(0)
+
+    # pair each triangle with the cells of its bounding rectangle
+    pair = np.repeat(np.arange(len(triangles)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    width = high[pair, 1] - low[pair, 1] + 1
+    x, z = low[pair, 0] + local // width, low[pair, 1] + local % width
+
+    # barycentric coordinates of the cell centers in the triangles seen from above
+    offset = origin + (np.stack([x, z], axis = 1) + 0.5) * cell_size - a[pair][:, [0, 2]]
+    u = (offset[:, 0] * ac[pair, 1] - ac[pair, 0] * offset[:, 1]) / determinant[pair]
+    v = (ab[pair, 0] * offset[:, 1] - offset[:, 0] * ab[pair, 1]) / determinant[pair]
+    inside = (u >= -epsilon) & (v >= -epsilon) & (u + v <= 1 + epsilon)
+
+    heights = a[pair, 1] + u * (b[pair, 1] - a[pair, 1]) + v * (c[pair, 1] - a[pair, 1])
+    return (x * shape[1] + z)[inside], heights[inside]
+
+
+class FloorField():
+    CELL_SIZE = 0.1
+    RADIUS = 32 # furthest the field reaches from the level's portal position, levels like the boat sit in endless water
+
+    def __init__(self, level: Level) -> None:
+        """
+        Heights of every surface above each cell of a grid over the level, built from the nodes that never move.
+        Each column's heights are sorted, so finding where something lands is a search through a few values
+        """
+        self.level = level
+        self.origin = np.zeros(2)
+        self.shape = (0, 0)
+        self.starts = np.zeros(1, dtype='i4') # the heights of cell i are heights[starts[i]:starts[i + 1]]
+        self.heights = np.zeros(0, dtype='f4')
+        self.built = False
+
+    def build(self) -> None:
+        """
+        Rasterizes the nodes of the level that are neither interactables nor physics bodies. Called once the level is generated
+        """
+        nodes = [node for node in self.level.scene.nodes if node.mesh and not node.physics_body and node not in self.level.interactables]
+        triangles = [get_triangles(node) for node in nodes]
+        self.built = True
+        if not triangles: return
+
+        center = np.array([self.level.portal_position.x, self.level.portal_position.z])
+        low = np.maximum(np.min([points[:, :, [0, 2]].min(axis = (0, 1)) for points in triangles], axis = 0), center - self.RADIUS)
+        high = np.minimum(np.max([points[:, :, [0, 2]].max(axis = (0, 1)) for points in triangles], axis = 0), center + self.RADIUS)
+        self.origin = low
+        self.shape = tuple(np.maximum(np.ceil((high - low) / self.CELL_SIZE).astype(int), 1))
+
+        cells, heights = zip(*[rasterize(points, self.origin, self.shape, self.CELL_SIZE) for points in triangles])
+        cells, heights = np.concatenate(cells), np.concatenate(heights)
+        order = np.lexsort((heights, cells))
+        self.heights = heights[order].astype('f4')
+        self.starts = np.searchsorted(cells[order], np.arange(self.shape[0] * self.shape[1] + 1)).astype('i4')
+
+    def height(self, position: glm.vec3) -> float | None:
+        """
+        Gets the height of the highest surface at or below the position, -inf if there is none and None if the position is outside the field
+        """
+        x, z = int((position.x - self.origin[0]) // self.CELL_SIZE), int((position.z - self.origin[1]) // self.CELL_SIZE)
+        if not (0 <= x < self.shape[0] and 0 <= z < self.shape[1]): return None
+        cell = x * self.shape[1] + z
+        column = self.heights[self.starts[cell]:self.starts[cell + 1]]
+        index = np.searchsorted(column, position.y, side = 'right') - 1
+        return float(column[index]) if index >= 0 else float('-inf')
+
+
+class FallingItems():
+
+    def __init__(self, level: Level) -> None:
+        """
+        Drops nodes onto the surfaces below them without the collision pipeline. Every falling node is integrated in one step per frame,
+        landing on the level's floor field or on the interactables and other moving nodes below it
+        """
+        self.level = level
+        self.items: list[tuple[Any, bsk.Node, bsk.Scene, Callable, float]] = [] # (parent, node, scene, end function, epsilon)
+
+    def add(self, parent: Any, node: bsk.Node, scene: bsk.Scene, end_func: Callable=None, epsilon: float=1e-3) -> None:
+        """
+        Starts dropping a node. The parent is marked as resting and the end function is called when it lands
+        """
+        self.items = [item for item in self.items if item[1] is not node] + [(parent, node, scene, end_func, epsilon)]
+
+    def update(self, dt: float) -> None:
+        """
+        Accelerates every falling node and snaps the ones that would reach their surface within the next step onto it.
+        Gravity is assumed to point down, the floor field only stores heights
+        """
+        self.items = [item for item in self.items if not item[0].resting and item[1].node_handler and item[1].node_handler.scene is item[2]]
+        if not self.items: return
+        if not self.level.floor.built: self.level.floor.build()
+        self.level.interaction.update()
+
+        gravity = self.level.game.player.gravity
+        direction = glm.normalize(gravity)
+        nodes = [item[1] for item in self.items]
+        epsilons = np.array([item[4] for item in self.items])
+        positions = np.array([node.position.data.to_tuple() for node in nodes])
+        extents = np.array([(node.mesh.half_dimensions * node.scale.data).to_tuple() for node in nodes])
+        velocities = np.array([node.velocity.to_tuple() for node in nodes]) + np.array(gravity.to_tuple()) * dt
+        bases = positions - extents + np.outer(epsilons, gravity.to_tuple())
+
+        surfaces = np.array([self.surface(glm.vec3(*base), node, direction) for base, node in zip(bases, nodes)])
+        gaps = bases[:, 1] - surfaces
+        landing = gaps / 2 <= np.linalg.norm(velocities, axis = 1) * dt + epsilons
+
+        for (parent, node, scene, end_func, epsilon), velocity, gap, lands in zip(self.items, velocities, gaps, landing):
+            if not lands:
+                node.velocity = glm.vec3(*velocity)
+                continue
+            parent.resting = True
+            node.position = node.position.data - glm.vec3(0, gap, 0)
+            node.velocity = glm.vec3(velocity[0], 0, velocity[2])
+            if end_func: end_func(dt)
+
+    def surface(self, base: glm.vec3, node: bsk.Node, direction: glm.vec3) -> float:
+        """
+        Gets the height of the first surface under the base of a falling node, scene raycasts are only used outside the floor field
+        """
+        height = self.level.floor.height(base)
+        if height is None:
+            cast = self.level.scene.raycast(base, direction)
+            return cast.position.y if cast.node and cast.node is not node else float('-inf')
+
+        distance, hit = self.level.interaction.cast_moving(base, direction, ignore = node)
+        return max(height, base.y - distance) if hit else height
@@ -18,7 +18,9 @@ def lerp(interact: Interactable, node: bsk.Node=None, time: float=1, position: g
     def func(dt: float) -> None:
         # play animation and store lerp value
         was1 = interact.percent == 1
+        percent = interact.percent
         interact.percent = glm.clamp(interact.percent + dt * interact.step / time, 0, 1)
+        if interact.percent == percent and interact.passive is func: return interact.sleep() # settled, setting the step wakes it
         node.position = glm.mix(original_position, final_position, interact.percent)
         node.rotation = glm.slerp(original_rotation, final_rotation, interact.percent)
         
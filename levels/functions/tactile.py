@@ -2,7 +2,6 @@ import glm
 import basilisk as bsk
 from typing import Callable
 from levels.interactable import Interactable
-import time
 
 def free(interact: Interactable, node: bsk.Node=None, sensitivity: float=0.35, camera: bsk.FreeCamera=None) -> Callable:
     """
@@ -67,12 +66,12 @@ def free_axis(interact: Interactable, axis :glm.vec3, node: bsk.Node=None) -> Ca
     
     # TODO add functionality for planes perpendicular to the camera's forward axis
     def func(dt: float) -> None:
-        if not game.mouse.left_down or time.time() - interact.last_time_registered > capture_time: 
-            interact.last_time_registered = time.time()
+        if not game.mouse.left_down or game.engine.time - interact.last_time_registered > capture_time: 
+            interact.last_time_registered = game.engine.time
             interact.positions = [None, None]
             interact.timer = 0 # TODO add rotational velocity at the end
             return
-        interact.last_time_registered = time.time()
+        interact.last_time_registered = game.engine.time
         
         # get mouse position every x time
         # interact.timer += dt
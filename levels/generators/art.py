@@ -1,6 +1,5 @@
 import basilisk as bsk
 import glm
-import random
 from player.held_items.held_item import HeldItem
 from player.held_items.interpolate import lerp_held
 from helper.type_hints import Game
@@ -235,7 +234,7 @@ def room(art: Level) -> None:
     scale = 1.5
     for x in range(-1, 2):
         for z in range(-1, 2):
-            color = random.choice(['red', 'orange', 'yellow', 'green', 'blue', 'purple'])
+            color = art.game.input.random.choice(['red', 'orange', 'yellow', 'green', 'blue', 'purple'])
             art.add(bsk.Node(
                 position = center + glm.vec3(2 * scale * x, 0, 2 * scale * z),
                 scale = (scale, 0.025, scale),
@@ -1,6 +1,5 @@
 import basilisk as bsk
 import glm
-import random
 from typing import Callable
 from helper.type_hints import Game
 from levels.level import Level
@@ -131,12 +130,12 @@ def drawers(bedroom: Level, key: Interactable) -> None:
         material = bedroom.game.materials['red'],
         rotation = glm.angleAxis(angle, (0, 1, 0))
     ) for position, angle in (
-        ((3.8, 1.4, -4.4), random.uniform(0, 2 * glm.pi())),
-        ((4, 1.4, -4.5), random.uniform(0, 2 * glm.pi())),
-        ((3.7, 1.4, -4.3), random.uniform(0, 2 * glm.pi())),
-        ((3.4, 1.4, -4.2), random.uniform(0, 2 * glm.pi())),
-        ((3.6, 1.4, -4.7), random.uniform(0, 2 * glm.pi())),
-        ((3.5, 1.4, -4.8), random.uniform(0, 2 * glm.pi())),
+        ((3.8, 1.4, -4.4), bedroom.game.input.random.uniform(0, 2 * glm.pi())),
+        ((4, 1.4, -4.5), bedroom.game.input.random.uniform(0, 2 * glm.pi())),
+        ((3.7, 1.4, -4.3), bedroom.game.input.random.uniform(0, 2 * glm.pi())),
+        ((3.4, 1.4, -4.2), bedroom.game.input.random.uniform(0, 2 * glm.pi())),
+        ((3.6, 1.4, -4.7), bedroom.game.input.random.uniform(0, 2 * glm.pi())),
+        ((3.5, 1.4, -4.8), bedroom.game.input.random.uniform(0, 2 * glm.pi())),
     )]: 
         drawers[1].node.add(node)
     
@@ -161,6 +160,7 @@ def drawers(bedroom: Level, key: Interactable) -> None:
     
     def frame_passive(dt: float) -> None:
         frame.node.position.z = locked_drawer.node.position.z + 0.25
+        frame.sleep(watch = locked_drawer.node)
     
     frame_pickup = pickup_function(frame, interact_to_frame(frame, PictureFrame(game, 'office')), top_text = 'swap')
     def frame_active(dt: float) -> None:
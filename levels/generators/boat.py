@@ -10,7 +10,6 @@ from levels.interactable import Interactable
 from levels.functions.imports import *
 from helper.transforms import connect
 from levels.classes.fish import FishTracker
-from images.images import images
 from ui.effects import ImageBounce
 from render.pixel import PixelRenderer, PixelQuantizedRenderer
 
@@ -71,6 +70,7 @@ def fishing(level: Level) -> None:
         water.t += dt
         water.node.position.y = glm.sin(water.t) * 0.45 - 1
     water.passive = water_passive
+    water.interval = 1 / 30 # the swell is slow enough to move at a lower rate
     
     level.add(water)
     
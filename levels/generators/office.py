@@ -28,6 +28,7 @@ def generate_chain(level: Level, positions: list[glm.vec3]) -> list[bsk.Node]:
 def office(game: Game) -> Level:
     # create basic layout for bedroom level
     office = Level(game, 'office', glm.vec3(4, 0, 0), GoochRenderer, GoochInvertedRenderer)
+    office.warms_night = True # the lights can be turned off from here
     office.add(*rect_room(0, 0, 8, 8, 4, game.materials['dirty_carpet'], game.materials['bright_wood'], game.materials['bright_wood']))
     
     desk(office)
@@ -118,10 +119,10 @@ def puzzle(office: Level) -> None:
         coffee_node.position = pos
         coffee_node.scale = sca
         coffee_node.rotation = rot
-        if not coffee_maker.held_item: return
+        if not coffee_maker.held_item: return coffee_maker.sleep() # woken by placing a mug
         match coffee_maker.stage:
             case 'done': 
-                if not coffee_maker.held_item.node.tags == ['empty_mug'] or not coffee_maker.on: return
+                if not coffee_maker.held_item.node.tags == ['empty_mug'] or not coffee_maker.on: return coffee_maker.sleep() # woken by placing a mug or the battery
                 coffee_maker.stage = 'starting'
                 coffee_maker.time = 0
                 coffee_maker.top = glm.vec3(top)
@@ -239,12 +240,14 @@ def puzzle(office: Level) -> None:
         game.day = True
         game.portal_handler.update_time()
         game.portal_handler.set_levels(game.portal_handler.main_level, game.portal_handler.other_level)
+        game.memory_handler.release_night()
         bulb_node.material = game.materials['bulb']
     
     # right socket (coffee)
     def right_in(dt: float) -> None:  
         game.sounds['BatteryInsert'].play()
         coffee_maker.on = True
+        coffee_maker.wake()
         coffee_icon.material = game.materials['green']
     def right_out(dt: float) -> None: 
         game.sounds['BatteryRemove'].play()
@@ -314,7 +317,9 @@ def desk(office: Level) -> None:
         wire.passive = None
         wire_pickup(dt)
     
-    def wire_passive(dt: float) -> None: wire.node.position.x = bottom_drawer.node.position.x + 0.35
+    def wire_passive(dt: float) -> None: 
+        wire.node.position.x = bottom_drawer.node.position.x + 0.35
+        wire.sleep(watch = bottom_drawer.node)
     wire.passive = wire_passive
     wire.active = wire_active
     
@@ -331,7 +336,9 @@ def desk(office: Level) -> None:
         pf.passive = None
         pf_pickup(dt)
         
-    def pf_passive(dt: float) -> None: pf.node.position.x = top_drawer.node.position.x + 0.1
+    def pf_passive(dt: float) -> None: 
+        pf.node.position.x = top_drawer.node.position.x + 0.1
+        pf.sleep(watch = top_drawer.node)
     pf.passive = pf_passive
     pf.active = pf_active
     
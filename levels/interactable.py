@@ -4,13 +4,36 @@ from helper.type_hints import Level
 
 
 class Interactable():
-    
-    def __init__(self, level: Level, node: Node, active: Callable=None, passive: Callable=None, **kwargs) -> None:
+
+    def __init__(self, level: Level, node: Node, active: Callable=None, passive: Callable=None, interval: float=0, **kwargs) -> None:
         self.level = level
         self.node = node # this Node is added to the Level scene when this Interactable is added to the Level
         self.active = active
         self.passive = passive
-        
+        self.interval = interval # least time between runs of the passive, which is given the time since its last run
+
         # allows the user to set arguments of any type they want
         for key, value in kwargs.items(): setattr(self, str(key), value)
-        
\ No newline at end of file
+
+    def sleep(self, time: float=None, watch: Node=None) -> None:
+        """
+        Stops running the passive until the time passes or the watched node moves.
+        Interacting with it, giving it a new passive, or setting its step also wakes it
+        """
+        self.level.scheduler.sleep(self, time, watch)
+
+    def wake(self) -> None: self.level.scheduler.wake(self)
+
+    @property
+    def passive(self) -> Callable: return self._passive
+    @passive.setter
+    def passive(self, value: Callable):
+        self._passive = value
+        if value: self.wake()
+
+    @property
+    def step(self) -> float: return self._step
+    @step.setter
+    def step(self, value: float):
+        self._step = value # direction of the lerp passive, which sleeps until it changes
+        self.wake()
\ No newline at end of file
@@ -0,0 +1,163 @@
+import glm
+import basilisk as bsk
+from levels.interactable import Interactable
+from helper.type_hints import Level
+
+
+def get_bounds(node: bsk.Node) -> tuple[glm.vec3, glm.vec3]:
+    """
+    Gets the world space bounding box of a node's mesh
+    """
+    points = [glm.vec3(node.model_matrix * point) for point in node.mesh.aabb_points]
+    low, high = glm.vec3(points[0]), glm.vec3(points[0])
+    for point in points[1:]: low, high = glm.min(low, point), glm.max(high, point)
+    return low, high
+
+def enter_distance(position: glm.vec3, inverse: glm.vec3, low: glm.vec3, high: glm.vec3) -> float | None:
+    """
+    Gets the distance along a ray to where it enters a bounding box, None if it misses
+    """
+    first, second = (low - position) * inverse, (high - position) * inverse
+    near, far = glm.min(first, second), glm.max(first, second)
+    enter, leave = max(near.x, near.y, near.z, 0), min(far.x, far.y, far.z)
+    return enter if enter <= leave else None
+
+def get_inverse(forward: glm.vec3) -> glm.vec3:
+    """
+    Gets the reciprocal of a ray direction for the box tests, with zero components replaced by a tiny value
+    """
+    return 1 / glm.vec3([value if abs(value) > 1e-9 else 1e-9 for value in forward])
+
+def cast_node(node: bsk.Node, position: glm.vec3, forward: glm.vec3) -> float:
+    """
+    Gets the distance to the closest triangle of the node on the ray, the same test as Scene.raycast
+    """
+    inverse = glm.inverse(node.model_matrix)
+    relative_position = inverse * position
+    relative_forward = glm.normalize(inverse * (position + forward) - relative_position)
+
+    best = float('inf')
+    for index in node.mesh.get_line_collided(relative_position, relative_forward):
+        intersection = bsk.moller_trumbore(relative_position, relative_forward, [node.mesh.points[i] for i in node.mesh.indices[index]])
+        if intersection: best = min(best, glm.length(node.model_matrix * intersection - position))
+    return best
+
+
+def get_moved(nodes: list[bsk.Node], matrices: list[glm.mat4]) -> list[bsk.Node]:
+    """
+    Gets the nodes whose transform was set since their model matrices were taken. Basilisk makes a new matrix after any change to the transform
+    """
+    return [node for node, matrix in zip(nodes, matrices) if node.model_matrix is not matrix]
+
+
+class AABBTree():
+    LEAF_SIZE = 4
+
+    def __init__(self, items: list[tuple[bsk.Node, glm.vec3, glm.vec3]]) -> None:
+        """
+        Bounding volume hierarchy over (node, low, high) boxes, split at the median of the longest axis
+        """
+        self.low, self.high = glm.vec3(items[0][1]), glm.vec3(items[0][2])
+        for _, low, high in items[1:]: self.low, self.high = glm.min(self.low, low), glm.max(self.high, high)
+
+        self.items = items if len(items) <= self.LEAF_SIZE else None
+        self.children: list[AABBTree] = []
+        if self.items: return
+
+        size = self.high - self.low
+        axis = 0 if size.x >= max(size.y, size.z) else 1 if size.y >= size.z else 2
+        items = sorted(items, key = lambda item: item[1][axis] + item[2][axis])
+        half = len(items) // 2
+        self.children = [AABBTree(items[:half]), AABBTree(items[half:])]
+
+    def cast(self, position: glm.vec3, forward: glm.vec3, inverse: glm.vec3, best: tuple[float, bsk.Node], ignore: bsk.Node=None) -> tuple[float, bsk.Node]:
+        """
+        Gets the closer of best and the closest node hit in the tree, skipping boxes that start past best
+        """
+        enter = enter_distance(position, inverse, self.low, self.high)
+        if enter is None or enter >= best[0]: return best
+
+        for child in self.children: best = child.cast(position, forward, inverse, best, ignore)
+        for node, low, high in self.items if self.items else []:
+            if node is ignore: continue
+            enter = enter_distance(position, inverse, low, high)
+            if enter is None or enter >= best[0]: continue
+            distance = cast_node(node, position, forward)
+            if distance < best[0]: best = (distance, node)
+        return best
+
+
+class InteractionIndex():
+
+    def __init__(self, level: Level) -> None:
+        """
+        Finds the interactable the camera is looking at without testing every node of the scene. Like the interaction raycast it replaces,
+        only nodes without colliders are hit, so walls and the player's hitbox do not get in the way. Interactables are kept in a tree with
+        the other nodes that can move, and are rebuilt when one of them does. The remaining nodes only block the view and are kept in a tree
+        that is rebuilt when nodes are added or removed. Basilisk calls any node without physics static, even if a script moves it,
+        so a node of the static tree that moves is moved to the dynamic tree. The result is cached until the camera or an indexed node moves
+        """
+        self.level = level
+        self.scene = level.scene
+
+        self.static: AABBTree = None
+        self.dynamic: AABBTree = None
+        self.fixed: list[bsk.Node] = [] # nodes of the static tree
+        self.moving: list[bsk.Node] = [] # nodes of the dynamic tree
+        self.moved: set[bsk.Node] = set() # nodes Basilisk calls static that were seen moving
+        self.fixed_matrices: list[glm.mat4] = [] # model matrices of the nodes when their tree was built
+        self.moving_matrices: list[glm.mat4] = []
+        self.members: tuple[int, int] = None # node and interactable counts the trees were built for
+
+        self.key: tuple = None # camera pose of the cached result
+        self.result: Interactable = None
+
+    def update(self) -> None:
+        """
+        Rebuilds the trees that are out of date
+        """
+        members = (len(self.scene.nodes), len(self.level.interactables))
+        moved = get_moved(self.fixed, self.fixed_matrices)
+        if members != self.members or moved:
+            self.members = members
+            self.moved.update(moved)
+            self.build()
+        elif get_moved(self.moving, self.moving_matrices): self.build_dynamic()
+
+    def build(self) -> None:
+        nodes = [node for node in self.scene.nodes if node.mesh and not node.collider]
+        self.moved &= set(nodes)
+        is_fixed = lambda node: node.static and node not in self.moved and node not in self.level.interactables
+        self.fixed = [node for node in nodes if is_fixed(node)]
+        self.moving = [node for node in nodes if not is_fixed(node)]
+        self.static = AABBTree([(node, *get_bounds(node)) for node in self.fixed]) if self.fixed else None
+        self.fixed_matrices = [node.model_matrix for node in self.fixed]
+        self.build_dynamic()
+
+    def build_dynamic(self) -> None:
+        self.dynamic = AABBTree([(node, *get_bounds(node)) for node in self.moving]) if self.moving else None
+        self.moving_matrices = [node.model_matrix for node in self.moving]
+        self.key = None
+
+    def cast(self, camera: bsk.FollowCamera) -> Interactable | None:
+        """
+        Gets the interactable whose node is the closest one in front of the camera, None if that node is not interactable
+        """
+        self.update()
+        key = (*camera.position, *camera.rotation)
+        if key == self.key: return self.result
+
+        position, forward = glm.vec3(camera.position), glm.normalize(camera.forward)
+        best = (float('inf'), None)
+        for tree in (self.dynamic, self.static):
+            if tree: best = tree.cast(position, forward, get_inverse(forward), best)
+
+        self.key, self.result = key, self.level[best[1]] if best[1] else None
+        return self.result
+
+    def cast_moving(self, position: glm.vec3, forward: glm.vec3, ignore: bsk.Node=None) -> tuple[float, bsk.Node]:
+        """
+        Gets the distance to and the closest node on a ray out of the interactables and other nodes that can move. Call update first
+        """
+        if not self.dynamic: return float('inf'), None
+        return self.dynamic.cast(position, forward, get_inverse(forward), (float('inf'), None), ignore)
@@ -2,6 +2,9 @@ import glm
 import basilisk as bsk
 from helper.type_hints import Game
 from levels.interactable import Interactable
+from levels.scheduler import PassiveScheduler
+from levels.interaction import InteractionIndex
+from levels.floor import FloorField, FallingItems
 from render.renderer import Renderer
 from render.pixel import PixelRenderer
 
@@ -16,9 +19,16 @@ class Level():
         self.scene.physics_engine.accelerations = [glm.vec3(0, -25, 0)]
         
         self.renderer = render_type(self.scene)
-        self.night_render = night_type(self.scene)
+        self.renderer.timer = self.game.gpu_timer
+        self.night_type = night_type
+        self._night_render: Renderer = None # created the first time night is shown
+        self.warms_night = False # reaching this level prepares night renderers in the background
 
         self.interactables: dict[bsk.Node, Interactable] = {}
+        self.scheduler = PassiveScheduler(self)
+        self.interaction = InteractionIndex(self)
+        self.floor = FloorField(self)
+        self.falling = FallingItems(self)
         
         self.portal_position = glm.vec3(portal_position)
         
@@ -29,8 +39,8 @@ class Level():
         self.scene.update(render, nodes, particles, collisions)
         self.game.player.body_node.position.y = 2.1
         self.game.player.body_node.velocity.y = 0
-        for interactable in self.interactables.values():
-            if interactable.passive: interactable.passive(self.game.engine.delta_time)
+        self.scheduler.update(self.game.engine.delta_time)
+        self.falling.update(self.game.engine.delta_time)
         
     def add(self, *args) -> None:
         """
@@ -42,6 +52,43 @@ class Level():
             elif isinstance(arg, Interactable): # if interactable, keep the remember which node goes to who for detemining who's being interacted with
                 self.scene.add(arg.node)
                 self.interactables[arg.node] = arg
+                self.scheduler.add(arg)
+    
+    def release_night(self) -> None:
+        """
+        Frees the night renderer's GPU memory. It is rebuilt if night is shown again
+        """
+        if not self._night_render or self._night_render is self.renderer: return
+        self._night_render.release()
+        self._night_render = None
+        
+    @property
+    def night_render(self) -> Renderer:
+        """
+        Renderer used at night. Levels that look the same at night reuse their day renderer
+        """
+        if self._night_render: return self._night_render
+        if self.night_type is type(self.renderer): self._night_render = self.renderer
+        else:
+            self._night_render = self.night_type(self.scene)
+            self._night_render.timer = self.game.gpu_timer
+        return self._night_render
+    
+    @property
+    def renderers(self) -> list[Renderer]:
+        """
+        Gets every renderer the level has created
+        """
+        if not self._night_render or self._night_render is self.renderer: return [self.renderer]
+        return [self.renderer, self._night_render]
+    
+    @property
+    def draw_calls(self) -> int:
+        """
+        Gets the number of batches the level's nodes are drawn with. Basilisk merges every node of a chunk that shares a shader and static flag into one batch
+        """
+        groups = self.scene.node_handler.chunk_handler.shader_groups.values()
+        return sum([1 for group in groups for chunks in group for chunk in chunks.values() if chunk.batch.vao])
     
     def __getitem__(self, node: bsk.Node) -> Interactable:
         """
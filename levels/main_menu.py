@@ -1,5 +1,5 @@
 import basilisk as bsk
-import random
+from render.state_tracker import state_tracker
 
 
 class MainMenu:
@@ -40,6 +40,7 @@ class MainMenu:
 
         if self.time <= 0.01: return
         self.time = 0
+        random = self.game.input.random # the game's generator, so replays show the same particles
         
         padding = 4
         padding_x = 6
@@ -80,6 +81,8 @@ class MainMenu:
         Updates the menu. Increments time. Checks for input. Adds particles. Handles start sequence.
         """
 
+        self.game.input.begin_frame()
+
         self.time += self.engine.delta_time
 
         if self.engine.mouse.click and not self.start_sequence:
@@ -111,4 +114,6 @@ class MainMenu:
             self.update()
 
             self.scene.update()
-            self.engine.update()
\ No newline at end of file
+            self.engine.update()
+
+        state_tracker.invalidate() # the menu's scenes wrote their skies over the portal pipeline's
\ No newline at end of file
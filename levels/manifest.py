@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+
+# this file lists the assets each level generator uses so they can be loaded only when the level is built.
+# materials only lists textured materials, plain color materials decode nothing and are always loaded
+
+
+@dataclass
+class LevelManifest():
+    meshes: list[str] = field(default_factory=list)
+    materials: list[str] = field(default_factory=list)
+    images: list[str] = field(default_factory=list) # ui images blitted while in the level
+
+
+# assets used by the menus, the player, and the shared ui. Loaded behind the loading screen
+CORE = LevelManifest(
+    meshes = ['four_star', 'john', 'picture_frame', 'empty_frame', 'selva_title', 'start'],
+    materials = ['picture_frame'],
+    images = [
+        'label_e.png', 'mouse.png', 'left_arrow.png', 'left_arrow_green.png', 'right_arrow.png', 'right_arrow_green.png',
+        'circled_x.png', 'circled_x_green.png'
+    ]
+)
+
+MANIFESTS: dict[str, LevelManifest] = {
+    'void1': LevelManifest(
+        meshes = ['picture_frame'],
+        images = ['label_remember.png', 'label_press_e.png']
+    ),
+    'bedroom1': LevelManifest(
+        meshes = [
+            'bed', 'desk', 'dresser', 'fake_door', 'lamp', 'paper', 'box_three', 'box_three_lid', 'brick', 'drawer', 'john', 'key',
+            'keycap', 'mug', 'picture_frame', 'safe', 'safe_door', 'safe_door_handle', 'sock', 'wheel_eight'
+        ],
+        materials = ['paper', 'box_three', 'fortune_dresser', 'john', 'picture_frame', 'safe_door_white', 'wheel_eight'] + [f'key{i}_white' for i in range(1, 10)],
+        images = ['bedroom_note1.png', 'label_mug.png', 'label_key.png', 'label_swap.png']
+    ),
+    'office': LevelManifest(
+        meshes = [
+            'battery', 'battery_box', 'bulb', 'coffee_icon', 'coffee_maker', 'coffee_mug', 'crt', 'cubicle', 'cylinder', 'desk', 'drawer',
+            'fake_door', 'mug', 'office_chair', 'office_window', 'paper', 'picture_frame', 'wire', 'work_desk'
+        ],
+        materials = [
+            'battery', 'battery_box', 'calendar', 'coffee_maker', 'coffee_mug', 'crt', 'drawer_color', 'fake_door', 'hang_in_there',
+            'i_love_barcodes', 'office_window', 'paper', 'picture_frame', 'scan_me'
+        ],
+        images = ['office_ad.png', 'label_battery.png', 'label_copper_wire.png']
+    ),
+    'boat': LevelManifest(
+        meshes = [
+            'bait_bucket', 'battery', 'boat', 'crank', 'cylinder', 'fishing_rod', 'paper', 'picture_frame', 'squid', 'worm',
+            'tuna', 'flounder', 'herring', 'bass', 'tilapia'
+        ],
+        materials = [
+            'bait_bucket', 'battery', 'boat', 'crank_cw', 'fish_master_2002', 'fishing_rod', 'ocean', 'paper', 'picture_frame', 'squid', 'worm',
+            'tuna', 'flounder', 'herring', 'bass', 'tilapia'
+        ],
+        images = [f'fishopedia{i}.png' for i in range(1, 6)] + [
+            'reel.png', 'label_battery.png', 'label_pyjama_squid.png', 'label_new_record.png',
+            'label_tuna.png', 'label_flounder.png', 'label_herring.png', 'label_bass.png', 'label_tilapia.png'
+        ]
+    ),
+    'art': LevelManifest(
+        meshes = [
+            'art_table', 'bear_chair', 'coffee_mug', 'cylinder', 'desk', 'easel', 'fake_door', 'key', 'paint_bucket', 'window_two_pane',
+            'half_torus', 'other_half_torus'
+        ],
+        materials = [
+            'art_ceiling', 'art_table', 'art_wall', 'bear_chair', 'color_combos', 'color_key', 'fake_door', 'key_color', 'key_key', 'water_mug',
+            'window_two_pane', 'paint_bucket_red', 'paint_bucket_yellow', 'paint_bucket_blue', 'squid'
+        ] + [f'squid_{color}' for color in ('red', 'orange', 'yellow', 'green', 'blue', 'purple')]
+    ),
+    'bedroom2': LevelManifest(
+        meshes = ['bed', 'desk', 'dresser', 'fake_door', 'lamp', 'paper', 'drawer', 'keycap', 'safe', 'safe_door'],
+        materials = ['bed', 'lamp', 'fake_door', 'paper', 'safe_door'] + [f'key{i}' for i in range(1, 10)],
+        images = ['bedroom_note2.png']
+    ),
+    'void2': LevelManifest(
+        meshes = ['picture_frame']
+    ),
+}
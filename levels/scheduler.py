@@ -0,0 +1,85 @@
+import heapq
+import basilisk as bsk
+from levels.interactable import Interactable
+from helper.type_hints import Level
+
+
+def get_transform(node: bsk.Node) -> tuple:
+    return tuple(node.position.data), tuple(node.rotation.data), tuple(node.scale.data)
+
+
+class PassiveScheduler():
+
+    def __init__(self, level: Level) -> None:
+        """
+        Runs the passives of a level's awake interactables. A passive can put its interactable to sleep until it is woken by a timer,
+        a change to a watched node, or directly, so the cost of a frame only depends on the interactables that are doing something
+        """
+        self.level = level
+        self.time = 0
+
+        self.awake: dict[Interactable, float] = {} # awake interactables and the time since their passive last ran
+        self.sleeping: dict[Interactable, int] = {} # sleeping interactables and the id of their sleep, timers of earlier sleeps are ignored
+        self.timers: list[tuple[float, int, Interactable]] = [] # heap of (wake time, sleep id, interactable)
+        self.watched: dict[Interactable, tuple[bsk.Node, tuple]] = {} # sleeping interactable -> (node, transform when it fell asleep)
+        self.sleeps = 0
+
+    def add(self, interactable: Interactable) -> None:
+        """
+        Starts running the passive of an interactable that was just added to the level
+        """
+        if interactable.passive: self.wake(interactable)
+
+    def update(self, dt: float) -> None:
+        """
+        Wakes the interactables whose timers ran out and runs every awake passive
+        """
+        self.time += dt
+        while self.timers and self.timers[0][0] <= self.time:
+            _, sleep, interactable = heapq.heappop(self.timers)
+            if self.sleeping.get(interactable) == sleep: self.wake(interactable)
+
+        self.run(list(self.awake), dt)
+
+        # passives move the watched nodes, so watchers run in the same frame instead of trailing a frame behind
+        woken = [interactable for interactable, (node, transform) in self.watched.items() if get_transform(node) != transform]
+        for interactable in woken: self.wake(interactable)
+        self.run(woken, dt)
+
+    def run(self, interactables: list[Interactable], dt: float) -> None:
+        """
+        Runs the passives of the interactables that are still awake, waiting out their interval.
+        Passives are given the time since they last ran rather than the frame's dt, the two only differ for interactables with an interval
+        """
+        for interactable in interactables:
+            if interactable not in self.awake: continue # put to sleep by an earlier passive
+            if not interactable.passive or self.level[interactable.node] is not interactable: # nothing left to run
+                del self.awake[interactable]
+                continue
+
+            elapsed = self.awake[interactable] + dt
+            if elapsed < interactable.interval:
+                self.awake[interactable] = elapsed
+                continue
+            self.awake[interactable] = 0
+            interactable.passive(elapsed)
+
+    def sleep(self, interactable: Interactable, time: float=None, watch: bsk.Node=None) -> None:
+        """
+        Stops running the interactable's passive until the time passes or the watched node moves.
+        Without any of them it sleeps until it is woken directly
+        """
+        self.awake.pop(interactable, None)
+        self.sleeps += 1
+        self.sleeping[interactable] = self.sleeps
+        if time is not None: heapq.heappush(self.timers, (self.time + time, self.sleeps, interactable))
+        if watch: self.watched[interactable] = (watch, get_transform(watch))
+
+    def wake(self, interactable: Interactable) -> None:
+        """
+        Runs the interactable's passive again from the next update. Interactables that are not in the level are ignored
+        """
+        if self.level[interactable.node] is not interactable: return
+        self.sleeping.pop(interactable, None)
+        self.watched.pop(interactable, None)
+        if interactable not in self.awake: self.awake[interactable] = 0
@@ -1,17 +1,24 @@
 from typing import Callable
 from helper.type_hints import Game
 from levels.level import Level
+from levels.manifest import MANIFESTS
 from memories.edge_matrix import EdgeMatrix
+from memories.prefetch import Prefetcher
+from render.framebuffer_pool import framebuffer_pool
+from render.state_tracker import state_tracker
 
 
 class MemoryHandler():
-    
+
     def __init__(self, game: Game) -> None:
         self.game = game
         self.nodes: dict[str, Level] = {}
+        self.factories: dict[str, Callable] = {}
         self.edges = EdgeMatrix()
         self.current_level: Level = None
-        
+        self.prefetcher = Prefetcher(game)
+        self.RENDER_MEMORY_BUDGET = 512 * 2 ** 20 # bytes of framebuffers kept before unused night renderers are released
+
     # functions for adding and accessing graphs
     def add_first(func: Callable) -> Callable:
         """
@@ -21,13 +28,49 @@ class MemoryHandler():
             func(self, *args, **kwargs)
             if len(self.nodes) == 1: self.current_level = list(self.nodes.values())[0]
         return wrapper
-    
+
+    def register(self, name: str, factory: Callable) -> None:
+        """
+        Stores a level generator. The level is built the first time it is accessed, except the first registered level which is built immediately
+        """
+        self.factories[name] = factory
+        if not self.current_level: self.build(name)
+
+    def build(self, name: str) -> Level:
+        """
+        Loads the assets listed in the level's manifest and runs its generator
+        """
+        if name in self.nodes: return self.nodes[name]
+        if name in MANIFESTS: self.game.load_manifest(MANIFESTS[name])
+        self.game.input.seed_level(name)
+        self[name] = self.factories[name](self.game)
+        self[name].floor.build()
+        self.game.refresh_atlas()
+        state_tracker.invalidate() # new scenes write their skies
+        return self.nodes[name]
+
+    def is_built(self, name: str) -> bool: return name in self.nodes
+
+    def render_memory(self) -> int:
+        """
+        Bytes of GPU memory held by the framebuffers of every built level and the shared pool
+        """
+        memory = sum([renderer.memory for level in self.nodes.values() for renderer in level.renderers])
+        return memory + sum([framebuffer_pool.framebuffer_bytes(framebuffer) for _, framebuffer in framebuffer_pool.allocated])
+
+    def release_night(self) -> None:
+        """
+        Releases the night renderers once it is day again, only if the renderers are holding more memory than the budget
+        """
+        if self.game.day and self.render_memory() > self.RENDER_MEMORY_BUDGET:
+            for level in self.nodes.values(): level.release_night()
+
     @add_first
     def add(self, name: str, level: Level) -> None: self[name] = level
-    
+
     @add_first
     def __setitem__(self, name: str, level: Level) -> None: self.nodes[name] = level
-    def __getitem__(self, name: str) -> Level: return self.nodes[name]
-    
-    
-    
+    def __getitem__(self, name: str) -> Level:
+        if name in self.nodes: return self.nodes[name]
+        if name in self.prefetcher: self.prefetcher.finish(name) # needed before prefetching finished, build the rest now
+        return self.build(name)
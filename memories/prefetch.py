@@ -0,0 +1,95 @@
+import time
+from typing import Generator
+from helper.type_hints import Game
+from levels.manifest import MANIFESTS, LevelManifest
+
+
+class Prefetcher():
+
+    def __init__(self, game: Game, budget: float=0.004) -> None:
+        """
+        Builds levels in the background before a portal needs them. Work is split into steps and spread over frames within the time budget
+        """
+        self.game = game
+        self.budget = budget # seconds of main thread time per frame
+        self.tasks: dict[str, Generator] = {} # level name -> remaining steps, most recently requested first
+
+    def request(self, name: str) -> None:
+        """
+        Queues a level to be built. Requesting a queued level moves it to the front
+        """
+        if self.game.memory_handler.is_built(name): return
+        task = self.tasks.pop(name) if name in self.tasks else self.steps(name)
+        self.tasks = {name : task, **self.tasks}
+
+    def warm_night(self) -> None:
+        """
+        Queues creating and warming the night renderers of every built level, behind any level requests
+        """
+        if 'night' not in self.tasks: self.tasks['night'] = self.night_steps()
+
+    def update(self) -> None:
+        """
+        Runs queued steps until the frame's budget is spent. At least one step is run so prefetching always progresses.
+        While input is recorded or replayed every queued task is finished in the frame it was queued, the time budget and the asset workers
+        would otherwise decide the frame a level appears in the portal
+        """
+        if self.game.input.mode:
+            while self.tasks: self.finish(next(iter(self.tasks)))
+            return
+
+        start = time.perf_counter()
+        while self.tasks:
+            name, task = next(iter(self.tasks.items()))
+            try: waiting = next(task)
+            except StopIteration:
+                del self.tasks[name]
+                continue
+
+            if waiting or time.perf_counter() - start > self.budget: return
+
+    def finish(self, name: str) -> None:
+        """
+        Runs every remaining step of a level immediately, used when the level is needed before prefetching is done
+        """
+        for waiting in self.tasks.pop(name, ()):
+            if waiting: time.sleep(0.001) # let the workers have the interpreter
+
+    def steps(self, name: str) -> Generator[bool, None, None]:
+        """
+        Steps for building and warming a level. Yields True while waiting on the asset workers, otherwise False after each step
+        """
+        # decode assets on the workers without blocking the frame
+        manifest = MANIFESTS.get(name, LevelManifest())
+        futures = self.game.queue_manifest(manifest)
+        while not all(future.done() for future in futures.values()): yield True
+        self.game.collect_manifest(manifest, futures)
+        yield False
+
+        # generator and atlas upload
+        level = self.game.memory_handler.build(name)
+        yield False
+
+        # draw once offscreen so textures are resident and the driver has finished with the shaders
+        renderer = level.renderer if self.game.day else level.night_render
+        renderer.update()
+        yield False
+        renderer.set_other()
+        renderer.render()
+        yield False
+
+    def night_steps(self) -> Generator[bool, None, None]:
+        """
+        Steps for creating and warming night renderers, one renderer per step
+        """
+        for level in list(self.game.memory_handler.nodes.values()):
+            if level.night_render is level.renderer: continue # first access creates the renderer
+            yield False
+            
+            if level in (self.game.portal_handler.main_level, self.game.portal_handler.other_level): continue # shader state is set by the portal handler
+            level.night_render.update()
+            level.night_render.set_other()
+            level.night_render.render()
+            yield False
+
+    def __contains__(self, name: str) -> bool: return name in self.tasks
@@ -1,11 +1,11 @@
 import time
-from typing import Any
 import glm
 import basilisk as bsk
 from helper.transforms import plane_mirror
 from helper.type_hints import Game, Level
 from player.held_items.held_item import HeldItem, PictureFrame
 from player.player_nodes import player_nodes
+from player.portal_crossing import PortalCrossing, cross_portals
 from player.held_items.held_ui import HeldUI
 from levels.classes.fish import FishTracker
 
@@ -29,7 +29,7 @@ class Player():
         self.item_l_ui = HeldUI(self.game, glm.vec3(-0.5, -0.4, 1.2))
         
         # game interaction variables
-        self.fish_tracker = FishTracker()
+        self.fish_tracker = FishTracker(self.game.input.random)
         
         self.gravity = glm.vec3(0, -9.8, 0)
         self.control_disabled = False
@@ -73,6 +73,10 @@ class Player():
         if not self.game.engine.keys[bsk.pg.K_LSHIFT]: return
         if self.game.key_down(bsk.pg.K_r):
             self.camera.rotation = glm.quat(1, 0, 0, 0)
+        if self.game.key_down(bsk.pg.K_t):
+            self.game.gpu_timer.toggle()
+        if self.game.key_down(bsk.pg.K_y):
+            self.game.gpu_timer.export()
         if self.game.key_down(bsk.pg.K_1):
             self.item_r = HeldItem(self.game, bsk.Node(
                 position = (3.5, 2.4, -4.35),
@@ -122,7 +126,7 @@ class Player():
         if current_level_name == self.item_l.level_name: return # portal was not changed
         self.game.close()
         # update portal exit
-        self.game.portal_handler.set_levels(self.game.current_level, self.game.memory_handler[self.item_l.level_name])
+        self.game.portal_handler.set_other_level(self.item_l.level_name)
         
     def teleport(self) -> None:
         """
@@ -168,23 +172,19 @@ class Player():
         # swap rendering
         
         self.game.portal_handler.swap()
+        if self.current_level.warms_night: self.game.memory_handler.prefetcher.warm_night()
         
         # update for next frame
         self.previous_position = glm.vec3(position)
         self.position.y = 2.1
         
-    def collide(self) -> None | Any:
+    def collide(self) -> None | PortalCrossing:
         """
-        Determines if the camera has collided with an object between frames 
+        Determines if the camera has passed through a portal of the current scene between frames 
         """
-        diff = self.camera.position - self.previous_position
-        direction, move_distance = glm.normalize(diff), glm.length(diff)
-        cast = self.game.current_scene.raycast(position=self.previous_position, forward=direction)
-        if not cast.node or len(cast.node.tags) != 2 or cast.node.tags[0] != 'portal': return
-        
-        cast_distance = glm.length(cast.position - self.previous_position)
-        if cast_distance > move_distance: return
-        return cast
+        scene = self.game.current_scene
+        portals = [portal for portal in (self.game.entry_portal, self.game.exit_portal) if portal.node_handler and portal.node_handler.scene is scene]
+        return cross_portals(portals, self.previous_position, glm.vec3(self.camera.position))
     
     def move(self, dt: float) -> None:
         """
@@ -203,15 +203,14 @@ class Player():
         If the player is pressing E, interact with what they are looking at. 
         """
         # determine if the player is interacting with a valid object
-        cast = self.current_scene.raycast(has_collisions=False) # will find the player's hitbox
-        if not cast.node: return
-        interactable = self.current_level[cast.node]
+        interactable = self.current_level.interaction.cast(self.current_scene.camera)
         if not interactable: return
         bsk.draw.blit(self.game.engine, self.game.images['label_e.png'], (self.game.win_size.x // 2, self.game.win_size.y // 2, 20, 20))
         if not self.game.keys[bsk.pg.K_e]: return
         
-        # use the Interactable's functionality
+        # use the Interactable's functionality, which can change what its passive has to do
         if interactable.active: interactable.active(dt)
+        interactable.wake()
 
     @property
     def position(self): return self.body_node.position
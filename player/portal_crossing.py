@@ -0,0 +1,43 @@
+import glm
+import basilisk as bsk
+
+
+class PortalCrossing():
+
+    def __init__(self, node: bsk.Node, position: glm.vec3, normal: glm.vec3, time: float) -> None:
+        """
+        Where a movement passed through a portal. Time is the fraction of the movement made before the crossing
+        """
+        self.node = node
+        self.position = position
+        self.normal = normal
+        self.time = time
+
+    def __repr__(self) -> str: return f'<PortalCrossing | {self.node.tags}, {self.position}, {self.time:.3}>'
+
+
+def cross_portal(portal: bsk.Node, start: glm.vec3, end: glm.vec3) -> PortalCrossing | None:
+    """
+    Tests a movement against the rectangle through the middle of the portal's mesh, facing its local z.
+    Points are sorted to a side of the plane, so a movement that stops on the plane crosses once and fast movements cannot skip it
+    """
+    inverse = glm.inverse(portal.model_matrix)
+    local_start, local_end = glm.vec3(inverse * start), glm.vec3(inverse * end)
+    center, half = portal.mesh.geometric_center, portal.mesh.half_dimensions
+
+    start_depth, end_depth = local_start.z - center.z, local_end.z - center.z
+    if (start_depth > 0) == (end_depth > 0): return None
+
+    time = start_depth / (start_depth - end_depth)
+    local = glm.mix(local_start, local_end, time)
+    if abs(local.x - center.x) > half.x or abs(local.y - center.y) > half.y: return None
+
+    normal = glm.normalize(glm.vec3(glm.transpose(inverse) * glm.vec4(0, 0, 1, 0)))
+    return PortalCrossing(portal, glm.mix(start, end, time), normal, time)
+
+def cross_portals(portals: list[bsk.Node], start: glm.vec3, end: glm.vec3) -> PortalCrossing | None:
+    """
+    Gets the first portal the movement passes through, None if it misses all of them
+    """
+    crossings = [crossing for crossing in [cross_portal(portal, start, end) for portal in portals] if crossing]
+    return min(crossings, key = lambda crossing: crossing.time) if crossings else None
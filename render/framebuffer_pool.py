@@ -0,0 +1,96 @@
+import basilisk as bsk
+from render.shader_cache import shader_cache
+
+# bytes of a texel for moderngl texture dtypes
+DTYPE_BYTES = {'f1' : 1, 'u1' : 1, 'i1' : 1, 'f2' : 2, 'u2' : 2, 'i2' : 2, 'f4' : 4, 'u4' : 4, 'i4' : 4}
+
+
+def release_framebuffer(framebuffer: bsk.Framebuffer) -> None:
+    """
+    Frees the framebuffer's textures and vertex arrays. Its shader is only freed if the shader cache does not own it,
+    framebuffers made without a shader compile a private one that Basilisk writes uniforms to until it is removed from the shader handler
+    """
+    engine = framebuffer.engine
+    for texture in framebuffer.color_attachments + [framebuffer.depth]: texture.release()
+    for resource in (framebuffer.fbo, framebuffer.vao, framebuffer.vbo): resource.release()
+
+    shader = framebuffer.shader
+    if shader and not shader_cache.owns(shader):
+        engine.shader_handler.shaders.discard(shader)
+        shader.program.release()
+        shader.program = None
+
+    # Basilisk's finalizer skips what is already cleared
+    framebuffer._color_attachments = framebuffer._depth_attachment = framebuffer.fbo = framebuffer.vao = framebuffer.vbo = framebuffer.shader = None
+    if framebuffer in engine.fbos: engine.fbos.remove(framebuffer)
+
+
+class FramebufferPool():
+
+    def __init__(self) -> None:
+        """
+        Shared render targets for passes whose output is only needed during a single render call.
+        Framebuffers are keyed by (shader, scale, linear filter), scale sets the size relative to the window
+        """
+        self.free: dict[tuple, list[bsk.Framebuffer]] = {}
+        self.allocated: list[tuple[tuple, bsk.Framebuffer]] = []
+
+    def lease(self, engine: bsk.Engine, shader: bsk.Shader=None, scale: float=1, linear_filter: bool=True) -> bsk.Framebuffer:
+        """
+        Gets an unused framebuffer matching the description, allocating one only if every matching framebuffer is leased.
+        Framebuffers without a shader share the cached frame shader instead of compiling their own
+        """
+        if not shader: shader = shader_cache.load(engine, engine.root + '/shaders/frame.vert', engine.root + '/shaders/frame.frag')
+        key = (engine, shader, scale, linear_filter)
+        free = self.free.setdefault(key, [])
+        if free: return free.pop()
+
+        framebuffer = bsk.Framebuffer(engine, shader, scale = scale, linear_filter = linear_filter)
+        self.allocated.append((key, framebuffer))
+        return framebuffer
+
+    def release(self, framebuffer: bsk.Framebuffer) -> None:
+        """
+        Returns a leased framebuffer to the pool
+        """
+        key = next(key for key, allocated in self.allocated if allocated is framebuffer)
+        self.free[key].append(framebuffer)
+
+    def trim(self) -> None:
+        """
+        Frees every framebuffer that is not leased, used when renderers start asking for different sizes
+        """
+        for key, free in self.free.items():
+            for framebuffer in free:
+                self.allocated = [(allocated_key, allocated) for allocated_key, allocated in self.allocated if allocated is not framebuffer]
+                release_framebuffer(framebuffer)
+            free.clear()
+
+    def report(self, renderers: list) -> dict[str, int]:
+        """
+        Compares the memory held by the pool against what the renderers would hold if each owned its transient framebuffers
+        """
+        pooled = sum([self.framebuffer_bytes(framebuffer) for _, framebuffer in self.allocated])
+        texel = self.framebuffer_bytes(self.allocated[0][1]) / self.pixels(self.allocated[0][1].texture.size, 1) if self.allocated else 8
+
+        unpooled = 0
+        for renderer in renderers:
+            for _, scale, _ in renderer.transient.values():
+                unpooled += int(texel * self.pixels(renderer.engine.win_size, scale))
+
+        return {'framebuffers' : len(self.allocated), 'pooled_bytes' : pooled, 'unpooled_bytes' : unpooled, 'saved_bytes' : unpooled - pooled}
+
+    def framebuffer_bytes(self, framebuffer: bsk.Framebuffer) -> int:
+        """
+        Gets the size of the framebuffer's color and depth textures
+        """
+        total = 0
+        for texture in (framebuffer.texture, framebuffer.depth):
+            total += self.pixels(texture.size, 1) * texture.components * DTYPE_BYTES.get(texture.dtype, 4)
+        return total
+
+    def pixels(self, size: tuple[int, int], scale: float) -> int: return int(size[0] * scale) * int(size[1] * scale)
+
+
+# shared by every renderer, only the main and other renderers are rendering at any time
+framebuffer_pool = FramebufferPool()
@@ -0,0 +1,140 @@
+import csv
+from collections import deque
+from contextlib import AbstractContextManager, ExitStack, contextmanager, nullcontext
+import moderngl as mgl
+import basilisk as bsk
+
+STAGE_SEPARATOR = ' / ' # between a pass's label and the label of a stage inside it
+
+class GPUTimer():
+
+    def __init__(self, ctx: mgl.Context, latency: int=3, history_length: int=600) -> None:
+        """
+        Measures the GPU time of render passes with timer queries. Results are read latency frames after they were recorded,
+        by which point the GPU has finished them and reading does not stall. Stages inside a pass are timed under the pass's label
+        """
+        self.ctx = ctx
+        self.latency = latency
+        self.enabled = False
+
+        self.free: list[mgl.Query] = []
+        self.current: list[tuple[str, mgl.Query]] = []
+        self.pending: deque[tuple[int, list[tuple[str, mgl.Query]]]] = deque()
+        self.open: list[str] = [] # labels of the measurements in progress, outermost first
+        self.segment = ExitStack() # holds the query of the innermost measurement
+
+        self.frame = 0
+        self.history: deque[tuple[int, dict[str, float]]] = deque(maxlen = history_length) # (frame, pass label -> milliseconds)
+        self.labels: list[str] = [] # every label seen, in the order they were first recorded
+
+    def measure(self, label: str) -> AbstractContextManager:
+        """
+        Context that times the GPU work issued inside it, does nothing while the timer is disabled
+        """
+        if not self.enabled: return nullcontext()
+        return self.query(label)
+
+    def stage(self, label: str) -> AbstractContextManager:
+        """
+        Context that times part of the measurement in progress, reported as a stage of it. Does nothing outside a measurement
+        """
+        if not self.enabled or not self.open: return nullcontext()
+        return self.query(self.open[-1] + STAGE_SEPARATOR + label)
+
+    @contextmanager
+    def query(self, label: str):
+        """
+        Times the block with queries from the pool. Time elapsed queries cannot nest,
+        so an enclosing measurement is stopped for the block and continues with a new query after it
+        """
+        if self.open: self.segment.close()
+        self.open.append(label)
+        self.begin(label)
+        try: yield
+        finally:
+            self.segment.close()
+            self.open.pop()
+            if self.open: self.begin(self.open[-1])
+
+    def begin(self, label: str) -> None:
+        """
+        Starts a query from the pool for the label
+        """
+        query = self.free.pop() if self.free else self.ctx.query(time = True)
+        self.current.append((label, query))
+        self.segment.enter_context(query)
+
+    def end_frame(self) -> None:
+        """
+        Queues the frame's queries and collects the frames that are old enough to read
+        """
+        if self.current: self.pending.append((self.frame, self.current))
+        self.current = []
+        self.frame += 1
+
+        while self.pending and self.pending[0][0] <= self.frame - self.latency: self.collect()
+
+    def collect(self) -> None:
+        """
+        Reads the oldest frame's queries into the history and returns them to the pool.
+        A stage's time is added to the passes it is part of as well, their own queries were stopped while it ran
+        """
+        frame, queries = self.pending.popleft()
+        timings = {}
+        for label, query in queries:
+            elapsed = query.elapsed / 1e6
+            parts = label.split(STAGE_SEPARATOR)
+            for depth in range(1, len(parts) + 1):
+                name = STAGE_SEPARATOR.join(parts[:depth])
+                timings[name] = timings.get(name, 0) + elapsed
+                if name not in self.labels: self.labels.append(name)
+            self.free.append(query)
+        self.history.append((frame, timings))
+
+    def last_frame(self) -> float | None:
+        """
+        Gets the total milliseconds of the most recent frame that was read, None while the timer is disabled or nothing was read
+        """
+        if not self.enabled or not self.history: return None
+        return sum([milliseconds for label, milliseconds in self.history[-1][1].items() if STAGE_SEPARATOR not in label])
+
+    def toggle(self) -> None:
+        """
+        Starts or stops timing. Stopping drops the frames that were not read yet
+        """
+        self.enabled = not self.enabled
+        for _, queries in self.pending: self.free.extend([query for _, query in queries])
+        self.pending.clear()
+
+    def averages(self, frames: int=60) -> dict[str, float]:
+        """
+        Gets the mean milliseconds of each pass over the last given frames. Passes that were culled in a frame count as zero
+        """
+        recent = list(self.history)[-frames:]
+        if not recent: return {}
+        return {label : sum([timings.get(label, 0) for _, timings in recent]) / len(recent) for label in self.labels}
+
+    def draw(self, engine: bsk.Engine, budget: float=1000 / 60) -> None:
+        """
+        Draws the average time of each pass as a bar, the marker is the frame budget in milliseconds. Stages are listed below their pass
+        """
+        if not self.enabled: return
+        x, y, width, height = 10, 10, 300, 16
+        averages = self.averages()
+
+        bsk.draw.rect(engine, (0, 0, 0, 160), (x - 5, y - 5, width + 160, (height + 4) * len(averages) + 10))
+        for label, milliseconds in averages.items():
+            bsk.draw.rect(engine, (220, 90, 60) if milliseconds > budget / 2 else (90, 200, 110), (x + 150, y, min(milliseconds / budget, 1) * width, height))
+            if STAGE_SEPARATOR in label: label = '- ' + label.split(STAGE_SEPARATOR)[-1]
+            bsk.draw.text(engine, label, (x + 70, y + height / 2), 0.5) # only the labels are text, Basilisk caches an image for every string it draws
+            y += height + 4
+        bsk.draw.line(engine, (255, 255, 255), (x + 150 + width, 10), (x + 150 + width, y))
+
+    def export(self, path: str='gpu_timings.csv') -> None:
+        """
+        Writes the history as a CSV with a row for each frame and a column of milliseconds for each pass
+        """
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['frame'] + self.labels)
+            for frame, timings in self.history: writer.writerow([frame] + [timings.get(label, 0) for label in self.labels])
@@ -1,18 +1,45 @@
 import basilisk as bsk
-from render.renderer import Renderer
+from render.renderer import Renderer, lease_transient
+from render.shader_cache import shader_cache
 
 
 class KuwaharaRenderer(Renderer):
-    def __init__(self, scene):
+    # kernel size and skip are in screen pixels, scale is the resolution the filter is evaluated at before upsampling
+    QUALITY = {
+        'high'   : {'size' : 9, 'skip' : 3, 'scale' : 1},
+        'medium' : {'size' : 9, 'skip' : 3, 'scale' : .5},
+        'low'    : {'size' : 6, 'skip' : 3, 'scale' : .5},
+    }
+
+    def __init__(self, scene, quality: str='high'):
         super().__init__(scene)
+        self.set_quality(quality)
+
+    def set_quality(self, quality: str) -> None:
+        """
+        Selects one of the QUALITY tiers. The shader variant for the tier is compiled once and shared
+        """
 
-        self.kuwahara_shader = bsk.Shader(self.engine, 'shaders/frame.vert', 'shaders/kuwahara.frag')
-        self.kuwahara_fbo    = bsk.Framebuffer(self.engine, self.kuwahara_shader)
+        if quality not in self.QUALITY: raise ValueError(f'KuwaharaRenderer has no quality {quality}, expected one of {list(self.QUALITY)}')
+        self.quality = quality
+        settings = self.QUALITY[quality]
 
+        self.scissor_padding = settings['size'] # kuwahara quadrants reach a kernel width away
+        self.kuwahara_shader = shader_cache.load(self.engine, 'shaders/frame.vert', 'shaders/kuwahara.frag', {'KERNEL_SIZE' : settings['size'], 'SKIP' : settings['skip']})
+        self.transient = {'kuwahara_fbo' : (self.kuwahara_shader, 1, True)}
+        if settings['scale'] < 1: self.transient['filtered_fbo'] = (None, settings['scale'], True)
+
+    @lease_transient
     def render(self) -> None:
         """
         Renders the scene onto the fbo. Can access with Renderer.texture
         """
-        
-        self.scene.render(self.kuwahara_fbo)
-        self.kuwahara_fbo.render(self.fbo)
\ No newline at end of file
+
+        with self.stage('scene'): self.scene.render(self.kuwahara_fbo)
+        if 'filtered_fbo' not in self.transient:
+            with self.stage('kuwahara'): self.kuwahara_fbo.render(self.fbo)
+            return
+
+        # filter at a lower resolution, the linear filter upsamples it
+        with self.stage('kuwahara'): self.kuwahara_fbo.render(self.filtered_fbo)
+        with self.stage('upsample'): self.filtered_fbo.render(self.fbo)
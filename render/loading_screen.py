@@ -1,5 +1,6 @@
 import os
 import basilisk as bsk
+from images.images import images
 
 
 class LoadingScreen:
@@ -7,7 +8,7 @@ class LoadingScreen:
     def __init__(self, game):
         self.engine = game.engine
 
-        self.banner = bsk.Image('images/basilisk_banner.png', flip_y=False)
+        self.banner = images['basilisk_banner.png']
 
         self.progess = 0
         self.total = len(os.listdir('./meshes')) + len(os.listdir('./sounds')) + len(os.listdir('./images')) * 2 + 8
@@ -18,9 +19,15 @@ class LoadingScreen:
         """
         Increments the progress bar and draws the screen
         """
-        
+
         # Increment the progress bar
         self.progess += 1
+        self.draw()
+
+    def draw(self):
+        """
+        Draws the screen without advancing the progress bar
+        """
 
         # Get display variables
         win_size = self.engine.win_size
@@ -32,8 +39,9 @@ class LoadingScreen:
 
         # Draw the progress
         p = 2
+        progress = min(self.progess, self.total)
         bsk.draw.rect(self.engine, (255, 255, 255), (x - p, y - p, w + p * 2, h + p * 2))
         bsk.draw.rect(self.engine, (0, 0, 0), (x, y, w, h))
-        bsk.draw.rect(self.engine, (255, 255, 255), (x + p, y + p, w / self.total * self.progess - p * 2, h - p * 2))
+        bsk.draw.rect(self.engine, (255, 255, 255), (x + p, y + p, w / self.total * progress - p * 2, h - p * 2))
 
-        self.engine.update()
\ No newline at end of file
+        self.engine.update()
@@ -1,5 +1,6 @@
 import basilisk as bsk
-from render.renderer import Renderer
+from render.renderer import Renderer, lease_transient
+from render.shader_cache import shader_cache
 import glm
 
 
@@ -9,28 +10,32 @@ class PixelRenderer(Renderer):
 
         # self.main_shader = bsk.Shader(self.engine, frag='shaders/blinnPhong.frag')
         # self.other_shader = bsk.Shader(self.engine, frag='shaders/blinnPhongOther.frag')
-        self.dither_shader = bsk.Shader(self.engine, 'shaders/frame.vert', 'shaders/dither.frag')
+        self.dither_shader = shader_cache.load(self.engine, 'shaders/frame.vert', 'shaders/dither.frag')
 
         # self.temp_fbo = bsk.Framebuffer(self.engine)
-        self.low_res_fbo = bsk.Framebuffer(self.engine, scale=.2, linear_filter=False)
-        self.dither_fbo = bsk.Framebuffer(self.engine, self.dither_shader, scale=.2, linear_filter=False)
+        self.transient = {
+            'low_res_fbo' : (None, .2, False),
+            'dither_fbo'  : (self.dither_shader, .2, False),
+        }
         self.fbo   = bsk.Framebuffer(self.engine, scale=.2, linear_filter=False)
+        self.dynamic_resolution = False # already renders at a fixed low resolution
 
 
+    @lease_transient
     def render(self) -> None:
         """
         Renders the scene onto the fbo. Can access with Renderer.texture
         """
         
         self.dither_shader.write(glm.vec2(self.engine.win_size) * .2, 'textureSize')
-        self.scene.render(self.low_res_fbo)
-        self.low_res_fbo.render(self.dither_fbo)
-        self.dither_fbo.render(self.fbo)
+        with self.stage('scene'): self.scene.render(self.low_res_fbo)
+        with self.stage('dither'): self.low_res_fbo.render(self.dither_fbo)
+        with self.stage('copy'): self.dither_fbo.render(self.fbo)
 
 
 class PixelQuantizedRenderer(PixelRenderer):
     def __init__(self, scene):
         super().__init__(scene)
 
-        self.dither_shader = bsk.Shader(self.engine, 'shaders/frame.vert', 'shaders/ditherQuantized.frag')
-        self.dither_fbo = bsk.Framebuffer(self.engine, self.dither_shader, scale=.2, linear_filter=False)
\ No newline at end of file
+        self.dither_shader = shader_cache.load(self.engine, 'shaders/frame.vert', 'shaders/ditherQuantized.frag')
+        self.transient['dither_fbo'] = (self.dither_shader, .2, False)
\ No newline at end of file
@@ -2,6 +2,10 @@ import basilisk as bsk
 import glm
 import moderngl as mgl
 from levels.level import Level
+from render.render_graph import RenderGraph
+from render.shader_cache import shader_cache
+from render.state_tracker import state_tracker, PORTAL_DEPTH_UNIT, OTHER_COLOR_UNIT, MAIN_COLOR_UNIT, MAIN_DEPTH_UNIT, SKY_UNIT
+from render.visibility import is_visible, screen_rect, rect_union
 
 
 class PortalHandler:
@@ -21,14 +25,11 @@ class PortalHandler:
         self.ctx    = main_level.scene.ctx
 
         # Load shaders
-        self.other_shader   = bsk.Shader(self.engine, 'shaders/other.vert' , 'shaders/other.frag'  )
-        self.portal_shader  = bsk.Shader(self.engine, 'shaders/portal.vert', 'shaders/portal.frag' )
-        self.combine_shader = bsk.Shader(self.engine, 'shaders/frame.vert' , 'shaders/combine.frag')
-
-        # Scene FBOs. Stores images and depths until needed
-        self.main_fbo    = bsk.Framebuffer(self.engine)
-        self.other_fbo   = bsk.Framebuffer(self.engine)
-        self.portal_fbo  = bsk.Framebuffer(self.engine)
+        self.other_shader   = shader_cache.load(self.engine, 'shaders/other.vert' , 'shaders/other.frag'  )
+        self.portal_shader  = shader_cache.load(self.engine, 'shaders/portal.vert', 'shaders/portal.frag' )
+        self.combine_shader = shader_cache.load(self.engine, 'shaders/frame.vert' , 'shaders/combine.frag')
+
+        # Composites onto the screen, the portal scene's target is leased by the render graph
         self.combine_fbo = bsk.Framebuffer(self.engine, self.combine_shader)
       
         # Create a scene for the portals
@@ -41,6 +42,8 @@ class PortalHandler:
         self.portal_scene.add(self.frame_portal)
         self.portal_scene.sky = None
 
+        self.pending_level: str = None # level waiting on the prefetcher before it is shown in the portal
+        self.portals_on_screen: list[bsk.Node] = []
         self.set_levels(main_level, other_level)
         self.set_positions(glm.vec3(0, -10000, 0), glm.vec3(5, -10000, 5))
         self.set_rotations(glm.quat(0, 0, 0, 0), glm.quat(0, 0, 0, 0))
@@ -49,6 +52,9 @@ class PortalHandler:
         """
         Updates the portal scene
         """
+        
+        if self.pending_level and self.game.memory_handler.is_built(self.pending_level):
+            self.set_levels(self.game.current_level, self.game.memory_handler[self.pending_level])
 
         self.main_renderer.update()
         if self.other_renderer != self.main_renderer: self.other_renderer.update()
@@ -72,36 +78,78 @@ class PortalHandler:
         self.portal_scene.camera.position = main_scene.camera.position
         self.portal_scene.camera.rotation = main_scene.camera.rotation
 
-    def render(self):
+        self.portals_on_screen = self.visible_portals
+
+    def add_passes(self, graph: RenderGraph):
+        """
+        Adds the portal pipeline to the render graph. Everything but the main scene is culled while no portal is on screen
+        """
+
+        portals_visible = lambda: bool(self.portals_on_screen)
+        graph.add_pass('portal_depth', self.render_portal_depth, outputs=['portal_depth'], active=portals_visible)
+        graph.add_pass('other_scene', self.render_other, inputs=['portal_depth'], outputs=['other_color'], label=lambda: f'other_scene {type(self.other_renderer).__name__}')
+        graph.add_pass('main_scene', self.render_main, outputs=['main_color', 'main_depth'], label=lambda: f'main_scene {type(self.main_renderer).__name__}')
+        graph.add_pass('composite', self.render_composite, inputs=['main_color', 'main_depth', 'other_color', 'portal_depth'], outputs=['screen'], active=portals_visible)
+        graph.add_pass('present', self.render_present, inputs=['main_color'], outputs=['screen'], active=lambda: not self.portals_on_screen)
+
+    def render_portal_depth(self, graph: RenderGraph):
         """
-        Renders both of the active scenes and renders the portals
+        Renders the portals to get the depth the other scene is cut to. The depth is read from the portal scene's input buffer,
+        so its color is left in the scene's own output buffer instead of a leased target
         """
 
-        # Render the base scenes
         self.ctx.disable(mgl.CULL_FACE)
-        self.portal_scene.render(self.portal_fbo)
-        self.other_renderer.other_shader.bind(self.portal_scene.frame.input_buffer.depth, 'depthTexture', 1)
+        self.portal_scene.render()
         self.ctx.enable(mgl.CULL_FACE)
 
+    def render_other(self, graph: RenderGraph):
+        """
+        Renders the other scene. It is only shaded where the portals are on screen
+        """
+
+        camera = self.main_renderer.scene.camera
+        self.other_renderer.set_scissor(rect_union([screen_rect(portal, camera) for portal in self.portals_on_screen]))
+        state_tracker.bind(self.other_renderer.other_shader, self.portal_scene.frame.input_buffer.depth, 'depthTexture', PORTAL_DEPTH_UNIT)
         self.other_renderer.render()
+
+    def render_main(self, graph: RenderGraph):
+        """
+        Renders the main scene
+        """
+
         self.main_renderer.render()
 
+    def render_composite(self, graph: RenderGraph):
+        """
+        Combines the main and other scenes on the screen using the depths of the scene and the portals
+        """
+
         self.bind_all()
+        self.combine_fbo.render(self.game.screen, auto_bind=False)
 
-        # Render the portals, using the other fbo texture
-        self.ctx.disable(mgl.CULL_FACE)
-        self.portal_fbo.clear()
-        self.portal_scene.render(self.portal_fbo)
-        self.ctx.enable(mgl.CULL_FACE)
+    def render_present(self, graph: RenderGraph):
+        """
+        Draws the main scene to the screen, nothing of the other scene can be seen
+        """
 
-        # Render the combined scene
-        self.combine_fbo.render(self.ctx.screen, auto_bind=False)
+        self.main_renderer.fbo.render(self.game.screen)
+
+    @property
+    def visible_portals(self) -> list[bsk.Node]:
+        """
+        Gets the portal nodes that could be on screen, the open portal and the held frame's portal
+        """
+        camera = self.main_renderer.scene.camera
+        portals = [self.portal] if self.game.portal_open else []
+        if self.game.player.item_l: portals.append(self.frame_portal)
+        return [portal for portal in portals if is_visible(portal, camera)]
 
     def set_levels(self, main_level: Level, other_level: Level):
         """
         Sets the main and other scene. 
         Main scene is where the player is, other scene is what is shown in the portal. 
         """
+        self.pending_level = None
         if main_level == other_level: return
         
         self.main_level = main_level
@@ -124,6 +172,19 @@ class PortalHandler:
 
         self.bind_all()
 
+    def set_other_level(self, name: str):
+        """
+        Sets the other scene by level name without stalling. 
+        A level that has not been built is prefetched and shown once it is ready, until then the portal keeps its current scene. 
+        """
+        memory_handler = self.game.memory_handler
+        if memory_handler.is_built(name):
+            self.set_levels(self.game.current_level, memory_handler[name])
+            return
+        
+        self.pending_level = name
+        memory_handler.prefetcher.request(name)
+
     def update_time(self):
         if self.game.day:
             self.main_renderer = self.main_level.renderer
@@ -137,23 +198,24 @@ class PortalHandler:
 
     def bind_all(self):
         """
-        Binds all the textures for the portal pipeline
+        Binds all the textures for the portal pipeline. Each texture has its own unit, so binds that are already in place are skipped
         """
         
         # Fixes a Basilisk bug :P
         if self.other_renderer.scene.sky and 'skyboxTexture' in self.other_renderer.other_shader.uniforms:
-            self.other_renderer.other_shader.bind(self.other_renderer.scene.sky.texture_cube, 'skyboxTexture', 8)
+            state_tracker.bind(self.other_renderer.other_shader, self.other_renderer.scene.sky.texture_cube, 'skyboxTexture', SKY_UNIT)
         
         self.main_renderer.bind()
         self.other_renderer.bind()
 
-        # Bind all stages
-        self.other_renderer.other_shader.bind(self.portal_scene.frame.input_buffer.depth, 'depthTexture', 1)
-        self.portal_shader.bind(self.other_renderer.texture, 'otherTexture', 2)
-        self.combine_shader.bind(self.main_renderer.texture, 'mainTexture', 3)
-        self.combine_shader.bind(self.other_renderer.texture, 'portalTexture', 4)
-        self.combine_shader.bind(self.main_renderer.scene.frame.input_buffer.depth,  'mainDepthTexture', 5)
-        self.combine_shader.bind(self.portal_scene.frame.input_buffer.depth, 'portalDepthTexture', 6)
+        # Bind all stages, the portal depth and other color are each read by two shaders from the same unit
+        portal_depth = self.portal_scene.frame.input_buffer.depth
+        state_tracker.bind(self.other_renderer.other_shader, portal_depth, 'depthTexture', PORTAL_DEPTH_UNIT)
+        state_tracker.bind(self.portal_shader, self.other_renderer.texture, 'otherTexture', OTHER_COLOR_UNIT)
+        state_tracker.bind(self.combine_shader, self.main_renderer.texture, 'mainTexture', MAIN_COLOR_UNIT)
+        state_tracker.bind(self.combine_shader, self.other_renderer.texture, 'portalTexture', OTHER_COLOR_UNIT)
+        state_tracker.bind(self.combine_shader, self.main_renderer.scene.frame.input_buffer.depth,  'mainDepthTexture', MAIN_DEPTH_UNIT)
+        state_tracker.bind(self.combine_shader, portal_depth, 'portalDepthTexture', PORTAL_DEPTH_UNIT)
 
     def set_positions(self, main_position: glm.vec3, other_position: glm.vec3):
         """
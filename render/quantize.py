@@ -1,38 +1,35 @@
 import basilisk as bsk
-from render.renderer import Renderer
+from render.renderer import Renderer, lease_transient
+from render.shader_cache import shader_cache
 import glm
 
 
 class QuantizeRenderer(Renderer):
     def __init__(self, scene):
         super().__init__(scene)
+        self.scissor_padding = 1 # edge detection samples neighboring pixels
 
-        self.main_shader = bsk.Shader(self.engine, frag='shaders/blinnPhong.frag')
-        self.other_shader = bsk.Shader(self.engine, frag='shaders/blinnPhongOther.frag')
+        self.main_shader = shader_cache.load(self.engine, frag='shaders/blinnPhong.frag')
+        self.other_shader = shader_cache.load(self.engine, frag='shaders/blinnPhongOther.frag')
 
-        self.quantize_shader = bsk.Shader(self.engine, 'shaders/frame.vert', 'shaders/quantize.frag')
-        self.outline_shader = bsk.Shader(self.engine, 'shaders/frame.vert', 'shaders/outline.frag')
-        self.combine_shader = bsk.Shader(self.engine, 'shaders/frame.vert', 'shaders/combineOutline.frag')
+        self.combine_shader = shader_cache.load(self.engine, 'shaders/frame.vert', 'shaders/outlineCombine.frag', {'QUANTIZE' : 1})
 
-        self.quantize_fbo    = bsk.Framebuffer(self.engine, shader=self.quantize_shader)
-        self.color_fbo       = bsk.Framebuffer(self.engine)
-        self.edge_detect_fbo = bsk.Framebuffer(self.engine, self.outline_shader)
-        self.outline_fbo     = bsk.Framebuffer(self.engine)
-        self.combine_fbo     = bsk.Framebuffer(self.engine, self.combine_shader)
+        self.transient = {
+            'color_fbo'   : (None, 1, True),
+            'combine_fbo' : (self.combine_shader, 1, True),
+        }
 
 
+    @lease_transient
     def render(self) -> None:
         """
         Renders the scene onto the fbo. Can access with Renderer.texture
         """
         
-        self.scene.render(self.quantize_fbo)
-        self.quantize_fbo.render(self.color_fbo)
-
-        self.edge_detect_fbo.bind(self.scene.frame.input_buffer.depth, 'depthTexture', 0)
-        self.edge_detect_fbo.bind(self.scene.frame.input_buffer.color_attachments[2], 'normalTexture', 1)
-        self.edge_detect_fbo.render(self.outline_fbo, auto_bind=False)
+        with self.stage('scene'): self.scene.render(self.color_fbo)
 
+        # edge detection, quantizing, and the composite run in a single pass
+        self.combine_fbo.bind(self.scene.frame.input_buffer.depth, 'depthTexture', 0)
+        self.combine_fbo.bind(self.scene.frame.input_buffer.color_attachments[2], 'normalTexture', 1)
         self.combine_fbo.bind(self.color_fbo.texture, 'mainTexture', 2)
-        self.combine_fbo.bind(self.outline_fbo.texture, 'outlineTexture', 3)
-        self.combine_fbo.render(self.fbo, auto_bind=False)
\ No newline at end of file
+        with self.stage('quantize'): self.combine_fbo.render(self.fbo, auto_bind=False)
\ No newline at end of file
@@ -0,0 +1,146 @@
+from typing import Callable
+import basilisk as bsk
+from render.framebuffer_pool import framebuffer_pool
+from render.gpu_timer import GPUTimer
+
+
+class RenderPass():
+
+    def __init__(self, name: str, execute: Callable, inputs: list[str]=None, outputs: list[str]=None, active: Callable=None, label: Callable=None) -> None:
+        """
+        A stage of the frame. Execute is called with the graph, which holds the pass's transient framebuffers.
+        Active is checked every frame, inactive passes are skipped and produce none of their outputs. Label names the pass in timings, defaulting to its name
+        """
+        self.name = name
+        self.execute = execute
+        self.inputs = inputs if inputs else []
+        self.outputs = outputs if outputs else []
+        self.active = active
+        self.label = label
+
+    def is_active(self) -> bool: return self.active() if self.active else True
+
+    def get_label(self) -> str: return self.label() if self.label else self.name
+
+    def __repr__(self) -> str: return f'<RenderPass {self.name} | {self.inputs} -> {self.outputs}>'
+
+
+class RenderGraph():
+
+    def __init__(self, engine: bsk.Engine, outputs: list[str]=None, timer: GPUTimer=None) -> None:
+        """
+        Runs the passes of a frame in dependency order, skipping every pass that does not contribute to the outputs.
+        Transient resources are leased from the framebuffer pool when first written and returned after their last use, so later passes reuse them
+        """
+        self.engine = engine
+        self.outputs = outputs if outputs else ['screen']
+        self.timer = timer
+
+        self.passes: list[RenderPass] = []
+        self.transients: dict[str, tuple[bsk.Shader, float, bool]] = {} # resource name -> (shader, scale, linear filter)
+        self.resources: dict[str, bsk.Framebuffer] = {} # transient resources leased for the current frame
+
+        self.order: list[RenderPass] = None # sorted on the first execute after the passes change
+        self.culled: list[str] = [] # names of the passes skipped in the last frame
+
+    def add_pass(self, name: str, execute: Callable, inputs: list[str]=None, outputs: list[str]=None, active: Callable=None, label: Callable=None) -> RenderPass:
+        """
+        Adds a pass to the graph. Passes that write the same resource run in the order they were added
+        """
+        if any(render_pass.name == name for render_pass in self.passes): raise ValueError(f'RenderGraph already has a pass {name}')
+        render_pass = RenderPass(name, execute, inputs, outputs, active, label)
+        self.passes.append(render_pass)
+        self.order = None
+        return render_pass
+
+    def remove_pass(self, name: str) -> None:
+        """
+        Removes a pass from the graph, passes that only fed it are culled from then on
+        """
+        if not any(render_pass.name == name for render_pass in self.passes): raise ValueError(f'RenderGraph has no pass {name}')
+        self.passes = [render_pass for render_pass in self.passes if render_pass.name != name]
+        self.order = None
+
+    def transient(self, name: str, shader: bsk.Shader=None, scale: float=1, linear_filter: bool=True) -> None:
+        """
+        Declares a resource as a pooled framebuffer that only lives between the passes that use it
+        """
+        self.transients[name] = (shader, scale, linear_filter)
+
+    def sort(self) -> list[RenderPass]:
+        """
+        Orders the passes so that each runs after the writers of its inputs
+        """
+        dependencies = {render_pass.name : set() for render_pass in self.passes}
+        for index, render_pass in enumerate(self.passes):
+            earlier = self.passes[:index]
+            for resource in render_pass.inputs:
+                # a pass that reads and writes a resource builds on the writers added before it
+                writers = earlier if resource in render_pass.outputs else self.passes
+                dependencies[render_pass.name].update(writer.name for writer in writers if writer is not render_pass and resource in writer.outputs)
+            for resource in render_pass.outputs:
+                dependencies[render_pass.name].update(writer.name for writer in earlier if resource in writer.outputs)
+
+        order = []
+        remaining = list(self.passes)
+        while remaining:
+            ready = next((render_pass for render_pass in remaining if not dependencies[render_pass.name]), None)
+            if not ready: raise ValueError(f'RenderGraph has a cycle between {[render_pass.name for render_pass in remaining]}')
+            order.append(ready)
+            remaining.remove(ready)
+            for names in dependencies.values(): names.discard(ready.name)
+        return order
+
+    def cull(self) -> list[RenderPass]:
+        """
+        Gets the active passes whose outputs are needed for the graph's outputs, in execution order
+        """
+        needed = set(self.outputs)
+        passes = []
+        for render_pass in reversed(self.order):
+            if not needed.intersection(render_pass.outputs) or not render_pass.is_active(): continue
+            passes.append(render_pass)
+            needed.update(render_pass.inputs)
+        return passes[::-1]
+
+    def execute(self) -> None:
+        """
+        Renders a frame
+        """
+        if self.order is None: self.order = self.sort()
+        passes = self.cull()
+        self.culled = [render_pass.name for render_pass in self.order if render_pass not in passes]
+
+        # index of the last pass that uses each transient, its framebuffer can be leased again after it
+        last_use = {}
+        for index, render_pass in enumerate(passes):
+            for resource in render_pass.inputs + render_pass.outputs:
+                if resource in self.transients: last_use[resource] = index
+
+        try:
+            for index, render_pass in enumerate(passes):
+                for resource in render_pass.outputs:
+                    if resource in self.transients and resource not in self.resources: self.lease(resource)
+                if self.timer:
+                    with self.timer.measure(render_pass.get_label()): render_pass.execute(self)
+                else: render_pass.execute(self)
+                for resource in [resource for resource, last in last_use.items() if last == index and resource in self.resources]:
+                    framebuffer_pool.release(self.resources.pop(resource))
+        finally:
+            for framebuffer in self.resources.values(): framebuffer_pool.release(framebuffer)
+            self.resources.clear()
+
+    def lease(self, resource: str) -> bsk.Framebuffer:
+        """
+        Gets a framebuffer from the pool for the transient resource
+        """
+        shader, scale, linear_filter = self.transients[resource]
+        framebuffer = self.resources[resource] = framebuffer_pool.lease(self.engine, shader, scale, linear_filter)
+        framebuffer.fbo.scissor = None # renderers restrict their leases to the portal region
+        return framebuffer
+
+    def __getitem__(self, resource: str) -> bsk.Framebuffer:
+        if resource not in self.resources: raise ValueError(f'RenderGraph has no leased resource {resource}')
+        return self.resources[resource]
+
+    def __contains__(self, resource: str) -> bool: return resource in self.resources
@@ -1,5 +1,30 @@
 import basilisk as bsk
 import moderngl as mgl
+import glm
+from typing import Callable
+from contextlib import AbstractContextManager, nullcontext
+from render.framebuffer_pool import framebuffer_pool, release_framebuffer
+from render.gpu_timer import GPUTimer
+from render.shader_cache import shader_cache
+from render.state_tracker import state_tracker
+
+
+def lease_transient(func: Callable) -> Callable:
+    """
+    Decorates render functions so the renderer's transient framebuffers are leased from the pool only while it renders
+    """
+    def wrapper(self, *args, **kwargs):
+        leased = {name : framebuffer_pool.lease(self.engine, shader, scale * self.resolution_scale, linear_filter) for name, (shader, scale, linear_filter) in self.transient.items()}
+        for name, framebuffer in leased.items(): setattr(self, name, framebuffer)
+        self.apply_scissor(leased.values()) # the previous lease may have had a different region
+        self.write_scale()
+        
+        try: return func(self, *args, **kwargs)
+        finally:
+            for name, framebuffer in leased.items():
+                framebuffer_pool.release(framebuffer)
+                setattr(self, name, None)
+    return wrapper
 
 
 class Renderer:
@@ -16,13 +41,28 @@ class Renderer:
 
         # Load the two used shaders
         # These should be essentially the same, but the other shader culls when behind the portal
-        self.main_shader  = bsk.Shader(self.engine)
-        self.other_shader = bsk.Shader(self.engine, 'shaders/other.vert', 'shaders/other.frag')
+        self.main_shader  = shader_cache.load(self.engine)
+        self.other_shader = shader_cache.load(self.engine, 'shaders/other.vert', 'shaders/other.frag')
 
         self.sample_sky = bsk.Sky(self.scene, 'images/black.png')
 
         # Load an FBO
         self.fbo   = bsk.Framebuffer(self.engine)
+        
+        # Framebuffers only used inside of render, leased from the pool. Attribute name -> (shader, scale, linear filter)
+        self.transient: dict[str, tuple[bsk.Shader, float, bool]] = {}
+
+        # Pixels around the scissor rectangle that are still rendered, for passes that sample neighboring pixels
+        self.scissor_rect = None
+        self.scissor_padding = 0
+
+        # Resolution relative to each framebuffer's normal scale, set by the ResolutionController
+        self.dynamic_resolution = True
+        self.resolution_scale = 1
+        self.base_scales: dict[str, float] = {}
+
+        # Times the stages of render under the graph pass that runs it, set by the Level
+        self.timer: GPUTimer = None
 
     def update(self) -> None:
         """
@@ -36,24 +76,32 @@ class Renderer:
         Renders the scene onto the fbo. Can access with Renderer.texture
         """
         
+        self.write_scale()
         self.scene.render(self.fbo)
 
+    def stage(self, label: str) -> AbstractContextManager:
+        """
+        Context that times a stage of render on its own, does nothing without a timer
+        """
+        return self.timer.stage(label) if self.timer else nullcontext()
+
     def bind(self) -> None:
+        """
+        Writes the scene's sky to its shader. Scenes without a sky sample a black one
+        """
+        
         if 'skyboxTexture' in self.scene.shader.uniforms:
-            if not self.scene.sky:
-                self.scene.sky = self.sample_sky
-                self.scene.sky.write()
-                self.scene.sky = None
-            else:
-                self.scene.sky.write()
+            state_tracker.write_sky(self.scene.sky if self.scene.sky else self.sample_sky, self.scene.shader)
 
     def set_main(self) -> None:
         """
         Sets this renderer as a renderer for a main scene.
         """
         
+        self.set_scissor(None)
         self.bind()
         self.scene.shader = self.main_shader
+        state_tracker.invalidate() # Basilisk writes the sky when the shader is set
 
     def set_other(self) -> None:
         """
@@ -62,6 +110,77 @@ class Renderer:
 
         self.bind()
         self.scene.shader = self.other_shader
+        state_tracker.invalidate() # Basilisk writes the sky when the shader is set
+
+    def set_scissor(self, rect: tuple[float, float, float, float] | None) -> None:
+        """
+        Restricts rendering to a (left, bottom, right, top) region given as fractions of the screen. None renders the whole screen.
+        Applies to every framebuffer of the renderer, so subclass passes are restricted as well.
+        """
+
+        self.scissor_rect = rect
+        self.apply_scissor([value for value in vars(self).values() if isinstance(value, bsk.Framebuffer)] + [self.scene.frame.input_buffer])
+
+    def apply_scissor(self, framebuffers: list[bsk.Framebuffer]) -> None:
+        """
+        Sets the scissor of the given framebuffers to the renderer's region
+        """
+
+        rect = self.scissor_rect
+        for framebuffer in framebuffers:
+            if rect is None:
+                framebuffer.fbo.scissor = None
+                continue
+
+            width, height = framebuffer.texture.size
+            left   = max(int(rect[0] * width)  - self.scissor_padding, 0)
+            bottom = max(int(rect[1] * height) - self.scissor_padding, 0)
+            right  = min(int(rect[2] * width  + 1) + self.scissor_padding, width)
+            top    = min(int(rect[3] * height + 1) + self.scissor_padding, height)
+            framebuffer.fbo.scissor = (left, bottom, right - left, top - bottom)
+
+    def set_resolution(self, scale: float) -> None:
+        """
+        Renders the scene and every framebuffer at the given fraction of their normal size. The portal composite upscales the output
+        """
+
+        if not self.dynamic_resolution: return
+        self.resolution_scale = scale
+
+        # the scene's input buffer is shared by the day and night renderers, so it is checked even if this renderer's scale is unchanged
+        framebuffers = {name : value for name, value in vars(self).items() if isinstance(value, bsk.Framebuffer)}
+        framebuffers['input_buffer'] = self.scene.frame.input_buffer
+        for name, framebuffer in framebuffers.items():
+            target = self.base_scales.setdefault(name, framebuffer.scale) * scale
+            if framebuffer.scale == target: continue
+            framebuffer.scale = target
+            framebuffer.resize()
+
+    def write_scale(self) -> None:
+        """
+        Writes the renderer's scale to its shaders for their screen space lookups. Shaders are shared between renderers through the cache,
+        so this is called right before each of the renderer's passes rather than when the scale changes
+        """
+
+        for shader in [value for value in vars(self).values() if isinstance(value, bsk.Shader)]:
+            if 'renderScale' in shader.uniforms: shader.write(glm.float32(self.resolution_scale), 'renderScale')
+
+    def release(self) -> None:
+        """
+        Frees the framebuffers and sky owned by this renderer. Shared shaders and pooled framebuffers are kept
+        """
+
+        for framebuffer in [value for value in vars(self).values() if isinstance(value, bsk.Framebuffer)]:
+            release_framebuffer(framebuffer)
+        self.sample_sky.texture_cube.release()
+
+    @property
+    def memory(self) -> int:
+        """
+        Bytes of GPU memory held by the renderer's own framebuffers
+        """
+        
+        return sum([framebuffer_pool.framebuffer_bytes(value) for value in vars(self).values() if isinstance(value, bsk.Framebuffer)])
 
     @property
     def texture(self) -> mgl.Texture:
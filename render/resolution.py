@@ -0,0 +1,72 @@
+import time
+from collections import deque
+import basilisk as bsk
+from render.framebuffer_pool import framebuffer_pool
+
+
+def refresh_interval(default: float=1 / 60) -> float:
+    """
+    Gets the seconds between refreshes of the display, the default if the display does not report its rate
+    """
+    rate = bsk.pg.display.get_current_refresh_rate()
+    return 1 / rate if rate > 0 else default
+
+
+class ResolutionController():
+
+    def __init__(self, target_frame_time: float=None, min_scale: float=0.5, max_scale: float=1, step: float=0.05, interval: float=0.5, down_threshold: float=0.9, up_threshold: float=0.6, max_delta_time: float=0.1, history_length: int=600) -> None:
+        """
+        Scales the renderers' internal resolution to hold the target frame time, the display's refresh interval by default.
+        The controller is given the time spent rendering rather than the time between frames, which vsync rounds up to the refresh interval.
+        Render times are averaged over an interval and the scale moves by at most one step per interval
+        """
+        self.target_frame_time = target_frame_time if target_frame_time else refresh_interval()
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.interval = interval
+        self.down_threshold = down_threshold # fractions of the target frame time the average render time is compared against
+        self.up_threshold = up_threshold
+        self.max_delta_time = max_delta_time
+
+        self.scale = max_scale
+        self.render_times: list[float] = []
+        self.elapsed = 0
+        self.history: deque[tuple[float, float, float]] = deque(maxlen = history_length) # (time, average render time, scale)
+
+    def update(self, render_time: float, dt: float) -> None:
+        """
+        Records the time spent rendering the frame and adjusts the scale once per interval.
+        Frames slower than the max delta time are hitches like level builds and are skipped, as they are for passives
+        """
+        if dt > self.max_delta_time: return
+        self.render_times.append(render_time)
+        self.elapsed += dt
+        if self.elapsed < self.interval: return
+
+        average = sum(self.render_times) / len(self.render_times)
+        self.render_times, self.elapsed = [], 0
+
+        # the band between the thresholds keeps the scale from oscillating around the target
+        scale = self.scale
+        if average > self.target_frame_time * self.down_threshold: scale -= self.step
+        elif average < self.target_frame_time * self.up_threshold: scale += self.step
+        scale = round(min(max(scale, self.min_scale), self.max_scale) / self.step) * self.step
+
+        if scale != self.scale: framebuffer_pool.trim() # pooled targets of the old size will not be leased again
+        self.scale = scale
+        self.history.append((time.perf_counter(), average, scale))
+
+    def apply(self, renderers: list) -> None:
+        """
+        Sets the scale of the given renderers, only the renderers that are drawing need to be kept up to date
+        """
+        for renderer in renderers: renderer.set_resolution(self.scale)
+
+    def query(self, seconds: float=None) -> list[tuple[float, float, float]]:
+        """
+        Gets the (time, average render time, scale) history, optionally only the last given seconds of it
+        """
+        if seconds is None: return list(self.history)
+        start = time.perf_counter() - seconds
+        return [entry for entry in self.history if entry[0] >= start]
@@ -0,0 +1,37 @@
+import basilisk as bsk
+from render.visibility import is_visible
+
+
+class SceneChanges():
+
+    def __init__(self, scene: bsk.Scene) -> None:
+        """
+        Detects when a scene would render differently from its last check, from its camera and the transforms and looks of its visible nodes.
+        Used for scenes that are rendered into their own framebuffer and blended over the screen, so an unchanged render can be reused
+        """
+        self.scene = scene
+        self.signature: tuple = None
+        self.dirty = True
+        self.visible = False
+
+    def update(self) -> bool:
+        """
+        Checks the scene after its update. Returns if it needs to be rendered again
+        """
+        camera = self.scene.camera
+        nodes = [node for node in self.scene.nodes if is_visible(node, camera)]
+        signature = (
+            tuple(camera.position), tuple(camera.rotation),
+            tuple([(node, tuple(node.position.data), tuple(node.rotation.data), tuple(node.scale.data), node.mesh, node.material) for node in nodes])
+        )
+
+        self.visible = bool(nodes)
+        self.dirty = signature != self.signature
+        self.signature = signature
+        return self.dirty
+
+    def invalidate(self) -> None:
+        """
+        Forces the next check to report a change, for when the scene's framebuffer lost its contents
+        """
+        self.signature = None
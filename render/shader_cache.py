@@ -0,0 +1,54 @@
+import hashlib
+import os
+import basilisk as bsk
+
+
+class ShaderCache():
+
+    def __init__(self, variant_folder: str='./shaders/.variants') -> None:
+        """
+        Process wide store of compiled shaders. Renderers that use the same source files share one program instead of compiling their own
+        """
+        self.variant_folder = variant_folder
+        self.shaders: dict[tuple, bsk.Shader] = {}
+
+    def load(self, engine: bsk.Engine, vert: str=None, frag: str=None, defines: dict[str, str]=None) -> bsk.Shader:
+        """
+        Gets the shader for the source files, compiling it the first time it is requested.
+        None uses Basilisk's default source for that stage. Defines are added after the #version line of both given stages
+        """
+        defines = tuple(sorted(defines.items())) if defines else ()
+        key = (engine, vert, frag, defines)
+        if key in self.shaders: return self.shaders[key]
+
+        if defines:
+            vert = self.variant(vert, defines) if vert else None
+            frag = self.variant(frag, defines) if frag else None
+
+        shader = self.shaders[key] = bsk.Shader(engine, vert, frag)
+        return shader
+
+    def owns(self, shader: bsk.Shader) -> bool:
+        """
+        Checks if the shader is shared through the cache, shared shaders must outlive the framebuffers and renderers using them
+        """
+        return any(shader is cached for cached in self.shaders.values())
+
+    def variant(self, path: str, defines: tuple[tuple[str, str]]) -> str:
+        """
+        Writes a copy of the source file with the defines inserted and returns its path. Variants are only rewritten when their contents change
+        """
+        with open(path) as file: lines = file.read().split('\n')
+        lines[1:1] = [f'#define {name} {value}' for name, value in defines] # the #version directive must stay first
+        source = '\n'.join(lines)
+
+        name, extension = os.path.splitext(os.path.basename(path))
+        variant_path = f'{self.variant_folder}/{name}-{hashlib.sha1(source.encode()).hexdigest()[:16]}{extension}'
+        if not os.path.exists(variant_path):
+            os.makedirs(self.variant_folder, exist_ok = True)
+            with open(variant_path, 'w') as file: file.write(source)
+        return variant_path
+
+
+# shared by every renderer, the portal handler, and the game
+shader_cache = ShaderCache()
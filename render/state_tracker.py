@@ -0,0 +1,70 @@
+import moderngl as mgl
+import basilisk as bsk
+
+# texture units owned by the portal pipeline. Basilisk uses 0 and 1 for frames, 8 for skies, and 9 - 15 for materials and images,
+# the renderers' combine passes use 0 - 2. Nothing else binds these, so what the tracker last bound is still bound
+PORTAL_DEPTH_UNIT = 3
+OTHER_COLOR_UNIT  = 4
+MAIN_COLOR_UNIT   = 5
+MAIN_DEPTH_UNIT   = 6
+SKY_UNIT          = 8 # shared with Basilisk's Sky.write, skies must be written through the tracker
+
+
+class StateTracker():
+
+    def __init__(self) -> None:
+        """
+        Mirrors the GL texture binding state set by the portal pipeline and skips binds that would not change it.
+        Counts the issued and avoided binds of each frame
+        """
+        self.units: dict[int, mgl.Texture | mgl.TextureCube] = {} # unit -> bound texture
+        self.samplers: dict[tuple[bsk.Shader, str], int] = {} # (shader, sampler uniform) -> unit
+
+        self.binds = 0
+        self.skipped = 0
+        self.last_frame = {'binds' : 0, 'skipped' : 0}
+
+    def bind(self, shader: bsk.Shader, texture: mgl.Texture | mgl.TextureCube, name: str, unit: int) -> None:
+        """
+        Points the shader's sampler at the unit and binds the texture to it, each only if it is not already set
+        """
+        key = (shader, name)
+        sampler_set = self.samplers.get(key) == unit
+        texture_set = self.units.get(unit) is texture
+
+        if sampler_set and texture_set:
+            self.skipped += 1
+            return
+
+        if not sampler_set:
+            shader.program[name] = unit
+            self.samplers[key] = unit
+        if not texture_set:
+            texture.use(location = unit)
+            self.units[unit] = texture
+        self.binds += 1
+
+    def write_sky(self, sky: bsk.Sky, shader: bsk.Shader) -> None:
+        """
+        Equivalent to Sky.write for the given scene shader
+        """
+        self.bind(sky.shader, sky.texture_cube, 'skyboxTexture', SKY_UNIT)
+        if 'skyboxTexture' in shader.uniforms: self.bind(shader, sky.texture_cube, 'skyboxTexture', SKY_UNIT)
+
+    def invalidate(self) -> None:
+        """
+        Forgets the tracked state, for when something outside of the tracker may have changed the bindings
+        """
+        self.units.clear()
+        self.samplers.clear()
+
+    def end_frame(self) -> None:
+        """
+        Stores the counts of the finished frame and starts counting the next
+        """
+        self.last_frame = {'binds' : self.binds, 'skipped' : self.skipped}
+        self.binds, self.skipped = 0, 0
+
+
+# shared by every renderer and the portal handler, GL binding state is global to the context
+state_tracker = StateTracker()
@@ -0,0 +1,45 @@
+from typing import Any
+import glm
+import basilisk as bsk
+
+# corners of the default cube mesh, used for nodes without a mesh
+CUBE_CORNERS = [glm.vec4(x, y, z, 1) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+
+
+def clip_corners(node: bsk.Node, camera: Any) -> list[glm.vec4]:
+    """
+    Projects the corners of the Node's mesh bounding box into the camera's clip space
+    """
+    corners = [glm.vec4(point, 1) for point in node.mesh.aabb_points] if node.mesh else CUBE_CORNERS
+    mvp = camera.m_proj * camera.m_view * node.model_matrix
+    return [mvp * corner for corner in corners]
+
+def is_visible(node: bsk.Node, camera: Any) -> bool:
+    """
+    Determines if any part of the Node's bounding box may be on screen.
+    Conservative, a box is only culled when all of its corners are outside the same side of the view frustum
+    """
+    corners = clip_corners(node, camera)
+    for axis in range(3):
+        if all(corner[axis] < -corner.w for corner in corners): return False
+        if all(corner[axis] > corner.w for corner in corners): return False
+    return True
+
+def screen_rect(node: bsk.Node, camera: Any) -> tuple[float, float, float, float]:
+    """
+    Gets the screen space bounds of the Node's bounding box as (left, bottom, right, top) fractions of the screen.
+    Boxes that cross the camera plane cannot be projected and cover the whole screen
+    """
+    corners = clip_corners(node, camera)
+    if any(corner.w <= 0 for corner in corners): return (0, 0, 1, 1)
+    
+    xs = [glm.clamp(corner.x / corner.w * 0.5 + 0.5, 0, 1) for corner in corners]
+    ys = [glm.clamp(corner.y / corner.w * 0.5 + 0.5, 0, 1) for corner in corners]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+def rect_union(rects: list[tuple[float, float, float, float]]) -> tuple[float, float, float, float]:
+    """
+    Gets the smallest rectangle containing all of the given rectangles
+    """
+    lefts, bottoms, rights, tops = zip(*rects)
+    return (min(lefts), min(bottoms), max(rights), max(tops))
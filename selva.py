@@ -1,8 +1,16 @@
+import argparse
 from game import Game
 
-game = Game()
+parser = argparse.ArgumentParser()
+parser.add_argument('--record', help='file to record the input of the playthrough to')
+parser.add_argument('--replay', help='recording to play back instead of reading input')
+args = parser.parse_args()
+
+game = Game(record = args.record, replay = args.replay)
 
 while game.engine.running:
     game.update()
 
+game.input.save()
+
 # Fortnite
\ No newline at end of file
@@ -54,6 +54,8 @@ flat in Material mtl;
 
 // Uniforms
 uniform vec2 viewportDimensions;
+// fraction of the window the scene is rendered at, unset reads as 0
+uniform float renderScale;
 uniform sampler2D depthTexture;
 
 uniform vec3 cameraPosition;
@@ -104,7 +106,7 @@ vec3 getNormal(Material mtl, mat3 TBN){
 }
 
 void main() {
-    vec2 screenuv = (gl_FragCoord.xy) / viewportDimensions;
+    vec2 screenuv = (gl_FragCoord.xy) / (viewportDimensions * (renderScale > 0.0 ? renderScale : 1.0));
     float portalDepth = texture(depthTexture, screenuv).r;
     float fragDepth = gl_FragCoord.z;
 
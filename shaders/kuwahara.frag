@@ -8,43 +8,42 @@ in vec2 uv;
 uniform sampler2D screenTexture;
 uniform vec2 viewportDimensions;
 
-const int size = 9;
-const int skip = 3;
+// Quality is chosen by KuwaharaRenderer through defines
+#ifndef KERNEL_SIZE
+#define KERNEL_SIZE 9
+#endif
+#ifndef SKIP
+#define SKIP 3
+#endif
+
+const int size = KERNEL_SIZE;
+const int skip = SKIP;
 
 
 float grayscale(vec3 color) {
     return dot(color.rgb, vec3(0.299, 0.587, 0.114));
 }
 
-// Calcualte the average color of the pixels in a quadrant
-vec3 quadrantMean (vec2 offset, int size) {
+// Calculate the average color and the standard deviation of the grayscale pixels in a quadrant from one set of fetches
+// The variance is E[g^2] - E[g]^2, the grayscale of the mean color equals the mean of the grayscales
+vec4 quadrant (vec2 offset) {
     vec3 total = vec3(0.0);
+    float squares = 0.0;
+    float count = 0.0;
 
     for (int x = 0; x < size; x+=skip) {
         for (int y = 0; y < size; y+=skip) {
-            total += texture(screenTexture, uv + vec2(x, y) * offset).rgb;
+            vec3 color = texture(screenTexture, uv + vec2(x, y) * offset).rgb;
+            float value = grayscale(color);
+            total += color;
+            squares += value * value;
+            count += 1.0;
         }
     }
 
-    total /= size * size / skip / skip;
-    return total;
-}
-
-// Calcualte the standard deviation of the grayscale pixels in a quadrant
-float quadrantStandardDeviation (vec3 color, vec2 offset, int size) {
-    float mean = grayscale(color);
-
-    float total = 0.0;
-    for (int x = 0; x < size; x+=skip) {
-        for (int y = 0; y < size; y+=skip) {
-            float diff = grayscale(texture(screenTexture, uv + vec2(x, y) * offset).rgb) - mean;
-            total += diff * diff;
-        }
-    }
-
-    total /= size * size / skip / skip;
-    total = sqrt(total);
-    return total;
+    vec3 mean = total / count;
+    float variance = max(squares / count - grayscale(mean) * grayscale(mean), 0.0);
+    return vec4(mean, sqrt(variance));
 }
 
 
@@ -52,23 +51,18 @@ void main()
 {
     vec2 offset = 1.0 / viewportDimensions;
 
-    vec3 c1 = quadrantMean(offset * vec2( 1.0,  1.0), size);
-    vec3 c2 = quadrantMean(offset * vec2(-1.0,  1.0), size);
-    vec3 c3 = quadrantMean(offset * vec2( 1.0, -1.0), size);
-    vec3 c4 = quadrantMean(offset * vec2(-1.0, -1.0), size);
+    vec4 q1 = quadrant(offset * vec2( 1.0,  1.0));
+    vec4 q2 = quadrant(offset * vec2(-1.0,  1.0));
+    vec4 q3 = quadrant(offset * vec2( 1.0, -1.0));
+    vec4 q4 = quadrant(offset * vec2(-1.0, -1.0));
 
-    float q1 = quadrantStandardDeviation(c1, offset * vec2( 1.0,  1.0), size);
-    float q2 = quadrantStandardDeviation(c2, offset * vec2(-1.0,  1.0), size);
-    float q3 = quadrantStandardDeviation(c3, offset * vec2( 1.0, -1.0), size);
-    float q4 = quadrantStandardDeviation(c4, offset * vec2(-1.0, -1.0), size);
-
-    float smallest = min(min(q1, q2), min(q3, q4));
+    float smallest = min(min(q1.a, q2.a), min(q3.a, q4.a));
 
     vec3 color = vec3(0.0);
-    if      (q1 == smallest) {color = c1;}
-    else if (q2 == smallest) {color = c2;}
-    else if (q3 == smallest) {color = c3;}
-    else if (q4 == smallest) {color = c4;}
+    if      (q1.a == smallest) {color = q1.rgb;}
+    else if (q2.a == smallest) {color = q2.rgb;}
+    else if (q3.a == smallest) {color = q3.rgb;}
+    else if (q4.a == smallest) {color = q4.rgb;}
 
     fragColor = vec4(color, 1.0);
-}
\ No newline at end of file
+}
@@ -57,6 +57,8 @@ flat in Material mtl;
 
 // Uniforms
 uniform vec2 viewportDimensions;
+// fraction of the window the scene is rendered at, unset reads as 0
+uniform float renderScale;
 uniform sampler2D depthTexture;
 
 uniform vec3 cameraPosition;
@@ -228,7 +230,7 @@ float getRoughness(Material mtl, vec2 uv) {
 
 void main() {
 
-    vec2 screenuv = (gl_FragCoord.xy) / viewportDimensions;
+    vec2 screenuv = (gl_FragCoord.xy) / (viewportDimensions * (renderScale > 0.0 ? renderScale : 1.0));
     float portalDepth = texture(depthTexture, screenuv).r;
     float fragDepth = gl_FragCoord.z;
 
@@ -3,23 +3,43 @@
 layout (location = 0) out vec4 fragColor;
 
 in vec2 uv;
+uniform sampler2D mainTexture;
 uniform sampler2D depthTexture;
 uniform sampler2D normalTexture;
 uniform vec2 viewportDimensions;
+// fraction of the window the scene is rendered at, unset reads as 0
+uniform float renderScale;
 uniform float near;
 uniform float far;
 
+// Fused outline.frag + combineOutline.frag (+ quantize.frag when QUANTIZE is defined)
+
 const float width = 1.0;
 
+#ifdef QUANTIZE
+const int n = 4;
+
+vec3 palette[n] = vec3[n](
+    vec3(255, 178, 0) / 255,
+    vec3(235, 91, 0)  / 255,
+    vec3(217, 22, 86) / 255,
+    vec3(100, 13, 95) / 255
+);
+
+float grayscale(vec3 color) {
+    return dot(color.rgb, vec3(0.299, 0.587, 0.114));
+}
+#endif
+
 float linearizeDepth(float depth) 
 {
     float z = depth * 2.0 - 1.0;
     return (2.0 * near * far) / (far + near - z * (far - near));	
 }
 
-void main()
-{ 
-    vec2 offset = 1.0 / viewportDimensions * width;  
+float outline()
+{
+    vec2 offset = 1.0 / (viewportDimensions * (renderScale > 0.0 ? renderScale : 1.0)) * width;  
 
     // List of offsets used for sampling the texture
     vec2 offsets[9] = vec2[](
@@ -50,5 +70,16 @@ void main()
 
     float t_depth = 4;
     float t_norm = 0.05;
-    fragColor = vec4(vec3(1 - int(depth_total > t_depth || normal_total.r > t_norm || normal_total.g > t_norm || normal_total.b > t_norm)), 1.0);
-}
\ No newline at end of file
+    return float(1 - int(depth_total > t_depth || normal_total.r > t_norm || normal_total.g > t_norm || normal_total.b > t_norm));
+}
+
+void main()
+{ 
+    vec3 color = texture(mainTexture, uv).rgb;
+
+#ifdef QUANTIZE
+    color = palette[n - int(floor(grayscale(color) * n)) - 1];
+#endif
+
+    fragColor = vec4(color * outline(), 1.0);
+}